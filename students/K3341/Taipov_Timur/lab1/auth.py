@@ -1,4 +1,9 @@
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 from typing import Optional, Annotated
 from dotenv import load_dotenv
@@ -8,7 +13,7 @@ from jose import jwt, JWTError
 
 import fastapi
 from passlib.hash import argon2
-from sqlmodel import Session, select
+from sqlmodel import select
 
 from connection import get_session
 from models import User
@@ -16,6 +21,99 @@ from models import User
 load_dotenv()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(os.cpu_count() or 1)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+JWT_KEYS = os.getenv("JWT_KEYS", "")
+JWT_ALGORITHM = "HS256"
+DEFAULT_KID = "default"
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+
+
+class PrincipalCache:
+    """
+    Ограниченный LRU-кэш пользователей по имени из токена (sub).
+
+    Запись живёт не дольше ttl секунд и не дольше срока действия токена (exp).
+    В кэше хранятся отсоединённые от сессии копии пользователя без пароля.
+    Кэш локален для процесса: при нескольких воркерах устаревание ограничено ttl.
+
+    Attributes:
+        maxsize (int): Максимальное число записей.
+        ttl (float): Время жизни записи в секундах.
+        hits (int): Число попаданий.
+        misses (int): Число промахов.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+
+    def get(self, name: str) -> Optional[User]:
+        """
+        Получить пользователя из кэша.
+
+        Args:
+            name (str): Имя пользователя.
+
+        Returns:
+            Optional[User]: Пользователь или None, если записи нет или она устарела.
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[name]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user: User, exp: Optional[float] = None) -> User:
+        """
+        Положить в кэш отсоединённую копию пользователя.
+
+        Args:
+            user (User): Пользователь, загруженный из базы.
+            exp (Optional[float]): Срок действия токена (unix-время).
+
+        Returns:
+            User: Сохранённая копия пользователя.
+        """
+        lifetime = self.ttl if exp is None else min(self.ttl, exp - time.time())
+        principal = User(**user.model_dump(exclude={"password"}))
+        if lifetime > 0 and self.maxsize > 0:
+            self._entries[user.name] = (time.monotonic() + lifetime, principal)
+            self._entries.move_to_end(user.name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, name: str) -> None:
+        """
+        Удалить пользователя из кэша.
+
+        Args:
+            name (str): Имя пользователя.
+        """
+        self._entries.pop(name, None)
+
+    def stats(self) -> dict:
+        """
+        Получить статистику кэша.
+
+        Returns:
+            dict: Размер, ёмкость, число попаданий и промахов.
+        """
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
 
 def hash_password(password: str) -> str:
     """
@@ -46,6 +144,231 @@ def verify_passwd(password: str, hashed_password: str) -> bool:
     return result
 
 
+class HashPool:
+    """
+    Пул процессов для хеширования и проверки паролей.
+
+    Argon2 занимает десятки миллисекунд процессорного времени и держит GIL,
+    поэтому вызовы выносятся в отдельные процессы. Если в очереди уже
+    queue_limit задач, новые запросы отклоняются с кодом 503.
+    При size == 0 вызовы выполняются в текущем процессе.
+
+    Attributes:
+        size (int): Число процессов.
+        queue_limit (int): Максимальное число ожидающих задач.
+        pending (int): Текущее число ожидающих задач.
+    """
+
+    def __init__(self, size: int, queue_limit: int):
+        self.size = size
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def run(self, fn, *args):
+        """
+        Выполнить функцию в пуле процессов.
+
+        Args:
+            fn: Функция верхнего уровня модуля (должна сериализоваться pickle).
+            *args: Аргументы функции.
+
+        Returns:
+            Результат вызова функции.
+
+        Raises:
+            HTTPException: Если очередь пула переполнена.
+        """
+        if self.size == 0:
+            return fn(*args)
+        if self.pending >= self.queue_limit:
+            raise HTTPException(status_code=503, detail="Too many password operations, try again later")
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.size)
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Остановить процессы пула."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+hash_pool = HashPool(HASH_POOL_SIZE, HASH_QUEUE_LIMIT)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Захешировать пароль в пуле процессов.
+
+    Args:
+        password (str): Обычный пароль в виде строки.
+
+    Returns:
+        str: Хешированный пароль.
+    """
+    return await hash_pool.run(hash_password, password)
+
+
+async def verify_passwd_async(password: str, hashed_password: str) -> bool:
+    """
+    Проверить пароль в пуле процессов.
+
+    Args:
+        password (str): Введённый пользователем пароль.
+        hashed_password (str): Хешированный пароль.
+
+    Returns:
+        bool: True, если пароль верный, иначе False.
+    """
+    return await hash_pool.run(verify_passwd, password, hashed_password)
+
+
+class KeyRing:
+    """
+    Набор ключей подписи JWT с поддержкой ротации.
+
+    Новые токены подписываются активным ключом, его идентификатор записывается в заголовок kid.
+    Токен проверяется ключом из своего kid, поэтому после ротации ранее выданные токены
+    остаются действительными, пока старый ключ есть в наборе. Токены без kid (выданные до
+    появления набора) проверяются ключом default.
+
+    Attributes:
+        keys (dict): Идентификатор ключа -> секрет.
+        active_kid (str): Идентификатор ключа для подписи новых токенов.
+    """
+
+    def __init__(self, keys: dict, active_kid: str):
+        self.keys = keys
+        self.active_kid = active_kid
+
+    @classmethod
+    def from_env(cls, spec: str, fallback: Optional[str]) -> "KeyRing":
+        """
+        Загрузить ключи из настройки JWT_KEYS.
+
+        Args:
+            spec (str): Ключи вида "kid:секрет,kid:секрет"; первый — активный.
+            fallback (Optional[str]): SECRET_KEY, используемый как ключ default.
+
+        Returns:
+            KeyRing: Набор ключей.
+        """
+        keys = dict(item.strip().split(":", 1) for item in spec.split(",") if item.strip())
+        active_kid = next(iter(keys), DEFAULT_KID)
+        if fallback:
+            keys.setdefault(DEFAULT_KID, fallback)
+        return cls(keys, active_kid)
+
+    def sign(self, payload: dict) -> str:
+        """
+        Подписать payload активным ключом.
+
+        Args:
+            payload (dict): Данные токена.
+
+        Returns:
+            str: JWT токен.
+        """
+        return jwt.encode(payload, self.keys[self.active_kid], algorithm=JWT_ALGORITHM,
+                          headers={"kid": self.active_kid})
+
+    def verify(self, token: str) -> dict:
+        """
+        Проверить подпись и срок действия токена ключом из его kid.
+
+        Args:
+            token (str): JWT токен.
+
+        Returns:
+            dict: Payload токена.
+
+        Raises:
+            JWTError: Если токен повреждён, просрочен или подписан неизвестным ключом.
+        """
+        kid = jwt.get_unverified_header(token).get("kid", DEFAULT_KID)
+        key = self.keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id: {kid}")
+        return jwt.decode(token, key, algorithms=[JWT_ALGORITHM])
+
+
+key_ring = KeyRing.from_env(JWT_KEYS, os.getenv("SECRET_KEY"))
+
+
+class TokenCache:
+    """
+    Ограниченный LRU-кэш проверенных токенов.
+
+    Ключ — SHA-256 токена, а не сам токен. Запись удаляется по истечении exp токена, поэтому
+    просроченный токен снова проходит полную проверку и отклоняется. Токены без exp
+    и недействительные токены не кэшируются.
+
+    Attributes:
+        maxsize (int): Максимальное число записей.
+        hits (int): Число попаданий.
+        misses (int): Число промахов.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        """
+        Получить payload токена из кэша.
+
+        Args:
+            digest (bytes): SHA-256 токена.
+
+        Returns:
+            Optional[dict]: Payload или None, если записи нет или токен просрочен.
+        """
+        entry = self._entries.get(digest)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, digest: bytes, payload: dict) -> None:
+        """
+        Положить payload проверенного токена в кэш.
+
+        Args:
+            digest (bytes): SHA-256 токена.
+            payload (dict): Payload токена.
+        """
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or self.maxsize <= 0:
+            return
+        self._entries[digest] = (exp, payload)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Получить статистику кэша.
+
+        Returns:
+            dict: Размер, ёмкость, число попаданий и промахов.
+        """
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
 def create_access_token(payload: dict) -> str:
     """
     Создать JWT токен на основе переданного payload.
@@ -54,42 +377,64 @@ def create_access_token(payload: dict) -> str:
         payload (dict): Данные, которые будут зашифрованы в токене.
 
     Returns:
-        str: Сгенерированный JWT токен.
+        str: Сгенерированный JWT токен, подписанный активным ключом key_ring.
     """
-    secret_key = os.getenv("SECRET_KEY")
-    token = jwt.encode(payload, secret_key, algorithm="HS256")
-    return token
+    return key_ring.sign(payload)
 
 
-def verify_token(token: str) -> str:
+def decode_token(token: str) -> dict:
     """
-    Проверить JWT токен и извлечь имя пользователя.
+    Проверить JWT токен и получить его payload.
+
+    Повторные проверки одного токена берутся из token_cache до истечения его exp.
 
     Args:
         token (str): JWT токен.
 
     Returns:
-        str: Имя пользователя (sub), если токен валиден.
+        dict: Payload токена (из кэша — общий объект, изменять его нельзя).
 
     Raises:
-        HTTPException: Если токен недействителен или не содержит имя пользователя.
+        HTTPException: Если токен недействителен.
     """
-    secret_key = os.getenv("SECRET_KEY")
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
     try:
-        payload = jwt.decode(token, secret_key, algorithms=["HS256"])
-        name = payload.get("sub")
-        return name
+        payload = key_ring.verify(token)
     except JWTError:
         raise HTTPException(
             status_code=401,
             detail="Invalid token"
         )
+    token_cache.put(digest, payload)
+    return payload
 
 
-def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], session=Depends(get_session)) -> User:
+def verify_token(token: str) -> str:
+    """
+    Проверить JWT токен и извлечь имя пользователя.
+
+    Args:
+        token (str): JWT токен.
+
+    Returns:
+        str: Имя пользователя (sub), если токен валиден.
+
+    Raises:
+        HTTPException: Если токен недействителен или не содержит имя пользователя.
+    """
+    return decode_token(token).get("sub")
+
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], session=Depends(get_session)) -> User:
     """
     Получить текущего авторизованного пользователя по токену.
 
+    Пользователь берётся из principal_cache; к базе данных запрос идёт только при промахе.
+    Возвращается отсоединённая от сессии копия без пароля.
+
     Args:
         token (str): JWT токен, переданный пользователем.
         session (Session): Сессия базы данных.
@@ -100,11 +445,15 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], session=Depe
     Raises:
         HTTPException: Если токен недействителен или пользователь не найден.
     """
-    name = verify_token(token)
-    user = session.exec(select(User).where(User.name == name)).first()
+    payload = decode_token(token)
+    name = payload.get("sub")
+    user = principal_cache.get(name)
+    if user:
+        return user
+    user = (await session.exec(select(User).where(User.name == name))).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return principal_cache.put(user, payload.get("exp"))
 
 
 
@@ -0,0 +1,105 @@
+"""
+Бенчмарк стоимости зависимости авторизации (get_current_user) до и после кэширования токенов.
+
+«До» — прежняя проверка: os.getenv("SECRET_KEY") и полное декодирование python-jose на каждый запрос.
+«После» — ключ из key_ring и payload из token_cache. Пользователь в обоих случаях берётся из
+principal_cache, поэтому база данных не участвует. Для каждого варианта выводится время
+одного вызова и доля одного ядра, которую зависимость занимает при 10 000 запросов в секунду.
+
+Запуск из каталога lab1:
+    python -m benchmarks.bench_auth --requests 100000 --tokens 1000
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from fastapi import HTTPException
+from jose import jwt, JWTError
+
+import auth
+from models import User
+
+TARGET_RPS = 10000
+
+
+def legacy_decode_token(token: str) -> dict:
+    """Прежняя реализация auth.decode_token."""
+    secret_key = os.getenv("SECRET_KEY")
+    try:
+        return jwt.decode(token, secret_key, algorithms=["HS256"])
+    except JWTError:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token"
+        )
+
+
+def uncached_decode_token(token: str) -> dict:
+    """Проверка ключом из key_ring без token_cache."""
+    try:
+        return auth.key_ring.verify(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token"
+        )
+
+
+async def measure(decode, tokens: list, requests: int) -> float:
+    """
+    Вызвать get_current_user requests раз, перебирая токены по кругу.
+
+    Args:
+        decode: Реализация decode_token, подставляемая в модуль auth.
+        tokens (list): Токены пользователей.
+        requests (int): Количество вызовов.
+
+    Returns:
+        float: Среднее время одного вызова в секундах.
+    """
+    original = auth.decode_token
+    auth.decode_token = decode
+    try:
+        for token in tokens:
+            await auth.get_current_user(token, session=None)
+        started = time.perf_counter()
+        for i in range(requests):
+            await auth.get_current_user(tokens[i % len(tokens)], session=None)
+        return (time.perf_counter() - started) / requests
+    finally:
+        auth.decode_token = original
+
+
+async def main(requests: int, count: int) -> None:
+    exp = datetime.utcnow() + timedelta(hours=1)
+    tokens = []
+    for i in range(count):
+        name = f"bench{i}"
+        auth.principal_cache.put(User(id=i + 1, name=name, email=f"{name}@example.com", password=""))
+        tokens.append(auth.create_access_token({"sub": name, "exp": exp}))
+    variants = {
+        "before: getenv + jose": legacy_decode_token,
+        "key ring, no cache": uncached_decode_token,
+        "after: key ring + cache": auth.decode_token,
+    }
+    print(f"{'variant':<26} {'us/call':>9} {'calls/s':>10} {f'cpu at {TARGET_RPS} rps':>18}")
+    baseline = None
+    for name, decode in variants.items():
+        seconds = await measure(decode, tokens, requests)
+        baseline = baseline or seconds
+        print(f"{name:<26} {seconds * 1e6:>9.1f} {1 / seconds:>10.0f} {seconds * TARGET_RPS:>17.1%}"
+              f"  x{baseline / seconds:.1f}")
+    print(f"token cache: {auth.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100000, help="количество вызовов на вариант")
+    parser.add_argument("--tokens", type=int, default=1000, help="число разных токенов (пользователей)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.tokens))
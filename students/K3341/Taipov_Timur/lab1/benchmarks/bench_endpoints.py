@@ -0,0 +1,353 @@
+"""
+Нагрузочный бенчмарк всех роутеров: перцентили задержки и пропускная способность.
+
+Заполняет базу (временную SQLite или DB_URL, в том числе Postgres) данными --users
+пользователей: задачами, проектами, тегами, записями времени, рутинами и уведомлениями.
+Затем каждый сценарий из SCENARIOS прогоняется --concurrency конкурентными клиентами
+в течение --duration секунд. Клиенты ходят в приложение через httpx.ASGITransport или
+по HTTP в уже запущенный сервер (--base-url; его база должна быть заполнена этим же
+скриптом с той же раскладкой, например с --seed-only). Эндпоинты удаления и регистрации
+не замеряются, так как меняют раскладку данных; смена пароля (users update) сохраняет
+прежний пароль, а /metrics доступен только при METRICS=1. Итоги печатаются таблицей и сохраняются
+в JSON (--output), чтобы сравнивать прогоны.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_endpoints --users 20 --tasks-per-user 500 --concurrency 8 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_endpoints.sqlite3"))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("NOTIFICATION_SCHEDULER", "0")
+
+import httpx
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from auth import create_access_token, hash_password
+from connection import engine
+from main import app
+from models import Notification, Project, ProjectTaskLink, Routine, Tag, TagTaskLink, Task, TaskStatus, TimeLog, User
+from rollups import rebuild_timelog_daily, recompute_time_spent
+
+CHUNK_SIZE = 20000
+BULK_SIZE = 100
+TOKEN_LIFETIME = timedelta(hours=12)
+PASSWORD = "bench"
+START = datetime(2026, 1, 1)
+WORDS = ["report", "review", "deploy", "design", "meeting", "invoice", "backup", "release", "draft", "audit"]
+
+
+class Layout:
+    """
+    Раскладка сгенерированных данных: сколько строк каждой коллекции у пользователя и их идентификаторы.
+
+    Строки пользователя u (1..users) занимают непрерывный диапазон идентификаторов,
+    поэтому сценарии могут выбирать собственные объекты пользователя без запросов к базе.
+
+    Attributes:
+        users (int): Количество пользователей.
+        tasks (int): Задач на пользователя.
+        projects (int): Проектов на пользователя.
+        tags (int): Тегов на пользователя.
+        timelogs (int): Записей времени на пользователя.
+        routines (int): Рутин на пользователя.
+        notifications (int): Уведомлений на пользователя.
+    """
+
+    def __init__(self, users: int, tasks: int):
+        self.users = users
+        self.tasks = tasks
+        self.projects = max(1, tasks // 50)
+        self.tags = max(2, tasks // 20)
+        self.timelogs = tasks * 2
+        self.routines = max(1, tasks // 10)
+        self.notifications = max(1, tasks // 5)
+
+    def task(self, user: int, index: int) -> int:
+        """Идентификатор index-й задачи пользователя."""
+        return (user - 1) * self.tasks + index + 1
+
+    def project(self, user: int, index: int) -> int:
+        """Идентификатор index-го проекта пользователя."""
+        return (user - 1) * self.projects + index + 1
+
+    def tag(self, user: int, index: int) -> int:
+        """Идентификатор index-го тега пользователя."""
+        return (user - 1) * self.tags + index + 1
+
+    def routine(self, user: int, index: int) -> int:
+        """Идентификатор index-й рутины пользователя."""
+        return (user - 1) * self.routines + index + 1
+
+
+def chunked_insert(connection, model, rows) -> None:
+    """
+    Вставить строки пачками по CHUNK_SIZE одним executemany на пачку.
+
+    Args:
+        connection (Connection): Соединение в открытой транзакции.
+        model: Табличная модель.
+        rows: Итерируемые словари строк.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK_SIZE:
+            connection.execute(insert(model), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(model), batch)
+
+
+def seed(layout: Layout, rng: random.Random) -> None:
+    """
+    Заполнить базу данными всех пользователей раскладки и пересчитать производные данные.
+
+    Args:
+        layout (Layout): Раскладка данных.
+        rng (random.Random): Генератор случайных чисел.
+    """
+    SQLModel.metadata.create_all(engine)
+    password = hash_password(PASSWORD)
+    statuses = list(TaskStatus)
+    users = range(1, layout.users + 1)
+    with engine.begin() as connection:
+        chunked_insert(connection, User, (
+            {"id": user, "name": f"bench{user}", "email": f"bench{user}@example.com", "password": password}
+            for user in users
+        ))
+        chunked_insert(connection, Task, (
+            {"id": layout.task(user, index), "name": " ".join(rng.sample(WORDS, 2)) + f" {index}",
+             "description": " ".join(rng.choices(WORDS, k=12)), "status": rng.choice(statuses),
+             "difficulty": rng.randint(1, 5), "priority": rng.randint(1, 5),
+             "deadline": START + timedelta(minutes=rng.randrange(525600)), "user_id": user}
+            for user in users for index in range(layout.tasks)
+        ))
+        chunked_insert(connection, Project, (
+            {"id": layout.project(user, index), "name": f"project {index}", "description": "", "user_id": user}
+            for user in users for index in range(layout.projects)
+        ))
+        chunked_insert(connection, ProjectTaskLink, (
+            {"project_id": layout.project(user, index % layout.projects), "task_id": layout.task(user, index)}
+            for user in users for index in range(layout.tasks)
+        ))
+        chunked_insert(connection, Tag, (
+            {"id": layout.tag(user, index), "name": f"tag {index}", "color": "red", "user_id": user}
+            for user in users for index in range(layout.tags)
+        ))
+        chunked_insert(connection, TagTaskLink, (
+            {"tag_id": layout.tag(user, tag), "task_id": layout.task(user, index)}
+            for user in users for index in range(layout.tasks)
+            for tag in {index % layout.tags, (index * 7 + 1) % layout.tags}
+        ))
+        timelogs = []
+        for user in users:
+            for _ in range(layout.timelogs):
+                begin = START + timedelta(minutes=rng.randrange(525600))
+                timelogs.append({"task_id": layout.task(user, rng.randrange(layout.tasks)), "user_id": user,
+                                 "start_time": begin, "end_time": begin + timedelta(minutes=rng.randint(5, 240))})
+        chunked_insert(connection, TimeLog, timelogs)
+        chunked_insert(connection, Routine, (
+            {"id": layout.routine(user, index), "name": f"routine {index}", "frequency": rng.choice(["daily", "weekly"]),
+             "count": 10, "task_id": layout.task(user, index), "user_id": user, "generated_count": 0}
+            for user in users for index in range(layout.routines)
+        ))
+        chunked_insert(connection, Notification, (
+            {"task_id": layout.task(user, rng.randrange(layout.tasks)), "user_id": user,
+             "remind_at": START + timedelta(minutes=rng.randrange(525600))}
+            for user in users for _ in range(layout.notifications)
+        ))
+    with Session(engine) as session:
+        rebuild_timelog_daily(session)
+        recompute_time_spent(session)
+
+
+def task_body(rng: random.Random) -> dict:
+    """Тело запроса создания или изменения задачи."""
+    return {"name": " ".join(rng.sample(WORDS, 2)), "description": "bench", "status": "active",
+            "difficulty": rng.randint(1, 5), "priority": rng.randint(1, 5),
+            "deadline": (START + timedelta(minutes=rng.randrange(525600))).isoformat()}
+
+
+# Сценарий по номеру пользователя, раскладке и генератору возвращает (метод, путь, аргументы httpx).
+SCENARIOS = {
+    "users list": lambda u, layout, rng: ("GET", "/users/", {}),
+    "users me": lambda u, layout, rng: ("GET", "/users/me", {}),
+    "users login": lambda u, layout, rng: ("POST", "/users/login", {"json": {"name": f"bench{u}", "password": PASSWORD}}),
+    "users update": lambda u, layout, rng: ("PATCH", "/users/update", {"json": {"password": PASSWORD}}),
+    "users auth cache": lambda u, layout, rng: ("GET", "/users/auth-cache", {}),
+    "tasks list": lambda u, layout, rng: ("GET", "/tasks", {}),
+    "tasks filtered": lambda u, layout, rng: (
+        "GET", "/tasks", {"params": {"status": "active", "priority_min": 3, "sort": "-priority"}}),
+    "tasks by tags": lambda u, layout, rng: (
+        "GET", "/tasks", {"params": {"tags_any": [layout.tag(u, 0), layout.tag(u, 1)], "tags_none": [layout.tag(u, 2 % layout.tags)]}}),
+    "tasks search": lambda u, layout, rng: ("GET", "/tasks/search", {"params": {"q": rng.choice(WORDS)}}),
+    "tasks get": lambda u, layout, rng: ("GET", f"/tasks/{layout.task(u, rng.randrange(layout.tasks))}", {}),
+    "tasks create": lambda u, layout, rng: ("POST", "/tasks", {"json": task_body(rng)}),
+    "tasks bulk": lambda u, layout, rng: ("POST", "/tasks/bulk", {"json": [task_body(rng) for _ in range(BULK_SIZE)]}),
+    "tasks update": lambda u, layout, rng: (
+        "PATCH", f"/tasks/{layout.task(u, rng.randrange(layout.routines, layout.tasks))}", {"json": task_body(rng)}),
+    "projects list": lambda u, layout, rng: ("GET", "/projects/", {}),
+    "projects summary": lambda u, layout, rng: ("GET", "/projects/summary", {}),
+    "project tasks": lambda u, layout, rng: (
+        "GET", f"/projects/{layout.project(u, rng.randrange(layout.projects))}/tasks", {}),
+    "projects create": lambda u, layout, rng: (
+        "POST", "/projects/", {"json": {"name": "bench", "description": "", "user_id": u}}),
+    "projects update": lambda u, layout, rng: (
+        "PATCH", f"/projects/{layout.project(u, rng.randrange(layout.projects))}",
+        {"json": {"name": " ".join(rng.sample(WORDS, 2)), "description": "bench", "user_id": u}}),
+    "projects cache": lambda u, layout, rng: ("GET", "/projects/cache", {}),
+    "tags list": lambda u, layout, rng: ("GET", "/tags/", {}),
+    "tags create": lambda u, layout, rng: ("POST", "/tags/", {"json": {"name": "bench", "color": "red", "user_id": u}}),
+    "timelogs list": lambda u, layout, rng: ("GET", "/timelogs/", {}),
+    "timelogs stats": lambda u, layout, rng: ("GET", "/timelogs/stats", {"params": {"group_by": "project"}}),
+    "timelogs export": lambda u, layout, rng: ("GET", "/timelogs/export", {"params": {"format": "csv"}}),
+    "timelogs create": lambda u, layout, rng: ("POST", "/timelogs/", {"json": {
+        "task_id": layout.task(u, rng.randrange(layout.tasks)), "user_id": u,
+        "start_time": "2026-06-01T10:00:00", "end_time": "2026-06-01T10:30:00"}}),
+    "routines list": lambda u, layout, rng: ("GET", "/routines/", {}),
+    "routine occurrences": lambda u, layout, rng: (
+        "GET", f"/routines/{layout.routine(u, rng.randrange(layout.routines))}/occurrences",
+        {"params": {"until": "2026-12-31T00:00:00"}}),
+    "routines materialize": lambda u, layout, rng: (
+        "POST", "/routines/materialize", {"params": {"until": "2026-01-08T00:00:00"}}),
+    "notifications list": lambda u, layout, rng: ("GET", "/notifications/", {}),
+    "notifications create": lambda u, layout, rng: ("POST", "/notifications/", {"json": {
+        "task_id": layout.task(u, rng.randrange(layout.tasks)), "user_id": u, "remind_at": "2030-01-01T00:00:00"}}),
+    "metrics": lambda u, layout, rng: ("GET", "/metrics", {}),
+}
+
+
+def percentile(quantiles: list, p: int) -> float:
+    """Перцентиль p (1..99) из результата statistics.quantiles(n=100)."""
+    return quantiles[p - 1]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, layout: Layout, tokens: dict, concurrency: int,
+                       duration: float, seed_value: int) -> dict:
+    """
+    Прогнать сценарий конкурентными клиентами и собрать статистику.
+
+    Каждый клиент работает от имени своего пользователя и шлёт запросы друг за
+    другом, пока не истечёт duration секунд.
+
+    Args:
+        client (httpx.AsyncClient): Клиент приложения.
+        name (str): Название сценария из SCENARIOS.
+        layout (Layout): Раскладка данных.
+        tokens (dict): Заголовки авторизации по номеру пользователя.
+        concurrency (int): Число одновременных клиентов.
+        duration (float): Длительность прогона в секундах.
+        seed_value (int): Зерно генераторов клиентов.
+
+    Returns:
+        dict: Число запросов, ошибок, запросов в секунду, перцентили задержки (мс) и коды ответов.
+    """
+    scenario = SCENARIOS[name]
+    latencies, statuses = [], Counter()
+
+    async def worker(number: int) -> None:
+        rng = random.Random(seed_value + number)
+        user = number % layout.users + 1
+        while time.perf_counter() < deadline:
+            method, url, kwargs = scenario(user, layout, rng)
+            began = time.perf_counter()
+            response = await client.request(method, url, headers=tokens[user], **kwargs)
+            latencies.append(time.perf_counter() - began)
+            statuses[response.status_code] += 1
+
+    deadline = time.perf_counter() + min(duration, 0.2)
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    latencies.clear()
+    statuses.clear()
+    began = time.perf_counter()
+    deadline = began + duration
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - began
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0] if latencies else 0] * 99
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0,
+        **{f"p{p}_ms": percentile(quantiles, p) * 1000 for p in (50, 90, 95, 99)},
+        "max_ms": max(latencies, default=0) * 1000,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def git_revision() -> str:
+    """Текущий коммит репозитория или пустая строка, если git недоступен."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def main(args: argparse.Namespace) -> None:
+    layout = Layout(args.users, args.tasks_per_user)
+    if not args.skip_seed:
+        began = time.perf_counter()
+        seed(layout, random.Random(args.seed))
+        print(f"seed {args.users} users x {args.tasks_per_user} tasks: {time.perf_counter() - began:.1f} s")
+    if args.seed_only:
+        return
+    # exp как у /users/login: токены без exp не попадают в auth.token_cache
+    exp = datetime.utcnow() + TOKEN_LIFETIME
+    tokens = {
+        user: {"Authorization": f"Bearer {create_access_token({'sub': f'bench{user}', 'exp': exp})}"}
+        for user in range(1, layout.users + 1)
+    }
+    names = [name for name in SCENARIOS if re.search(args.only, name)]
+    transport = None if args.base_url else httpx.ASGITransport(app=app)
+    results = []
+    print(f"{'scenario':>22} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url=args.base_url or "http://bench", timeout=60) as client:
+        for name in names:
+            result = await run_scenario(client, name, layout, tokens, args.concurrency, args.duration, args.seed)
+            results.append(result)
+            print(f"{name:>22} {result['requests']:>9} {result['errors']:>7} {result['rps']:>8.1f} "
+                  f"{result['p50_ms']:>8.2f} {result['p90_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+    if args.output:
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "database": engine.dialect.name,
+            "async_db": os.getenv("ASYNC_DB", "0") == "1",
+            "python": platform.python_version(),
+            "target": args.base_url or "asgi",
+            "config": {"users": args.users, "tasks_per_user": args.tasks_per_user, "concurrency": args.concurrency,
+                       "duration": args.duration, "seed": args.seed},
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20, help="количество пользователей")
+    parser.add_argument("--tasks-per-user", type=int, default=500, help="задач на пользователя (остальные коллекции пропорционально)")
+    parser.add_argument("--concurrency", type=int, default=8, help="число одновременных клиентов")
+    parser.add_argument("--duration", type=float, default=3.0, help="длительность каждого сценария в секундах")
+    parser.add_argument("--only", default="", help="регулярное выражение для выбора сценариев")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора данных и запросов")
+    parser.add_argument("--base-url", help="адрес запущенного сервера вместо ASGI-транспорта")
+    parser.add_argument("--skip-seed", action="store_true", help="не заполнять базу (она уже заполнена)")
+    parser.add_argument("--seed-only", action="store_true", help="только заполнить базу")
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    asyncio.run(main(parser.parse_args()))
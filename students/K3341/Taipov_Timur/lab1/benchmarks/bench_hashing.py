@@ -0,0 +1,55 @@
+"""
+Бенчмарк пропускной способности проверки паролей (логина) в зависимости от размера пула процессов.
+
+Запуск из каталога lab1:
+    python -m benchmarks.bench_hashing --requests 200
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DB_URL", "sqlite://")
+
+from auth import HashPool, hash_password, verify_passwd
+
+
+async def measure(pool: HashPool, requests: int, hashed: str) -> float:
+    """
+    Выполнить requests одновременных проверок пароля и вернуть число проверок в секунду.
+
+    Args:
+        pool (HashPool): Пул процессов.
+        requests (int): Количество проверок.
+        hashed (str): Хеш пароля.
+
+    Returns:
+        float: Проверок в секунду.
+    """
+    await asyncio.gather(*(pool.run(verify_passwd, "password", hashed) for _ in range(max(pool.size, 1))))
+    started = time.perf_counter()
+    await asyncio.gather(*(pool.run(verify_passwd, "password", hashed) for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, max_size: int) -> None:
+    hashed = hash_password("password")
+    sizes = [0] + [size for size in (1, 2, 4, 8, 16, 32, 64) if size < max_size] + [max_size]
+    baseline = None
+    print(f"{'pool size':>10} {'logins/s':>10} {'speedup':>8}")
+    for size in sizes:
+        pool = HashPool(size, queue_limit=requests)
+        try:
+            rate = await measure(pool, requests, hashed)
+        finally:
+            pool.shutdown()
+        baseline = baseline or rate
+        print(f"{size:>10} {rate:>10.1f} {rate / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200, help="количество проверок на каждый размер пула")
+    parser.add_argument("--max-size", type=int, default=os.cpu_count() or 1, help="максимальный размер пула")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.max_size))
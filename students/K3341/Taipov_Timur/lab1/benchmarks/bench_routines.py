@@ -0,0 +1,89 @@
+"""
+Бенчмарк генерации повторений для большого числа рутин одного пользователя.
+
+По умолчанию создаёт временную базу SQLite (или использует DB_URL) и заполняет её.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_routines --routines 100000 --days 7
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_routines.sqlite3"))
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+
+from connection import engine, open_session
+from models import Routine, RoutineType, Task, User
+from recurrence import materialize_occurrences
+
+
+def seed(routines: int, start: datetime) -> None:
+    """
+    Создать пользователя и routines рутин, каждая со своей исходной задачей.
+
+    Args:
+        routines (int): Количество рутин.
+        start (datetime): Срок исходных задач.
+    """
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    frequencies = list(RoutineType)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "name": "bench", "email": "bench@example.com", "password": "-"}])
+        for offset in range(0, routines, 10000):
+            ids = range(offset + 1, min(offset + 10000, routines) + 1)
+            connection.execute(insert(Task), [
+                {"id": task_id, "name": f"routine {task_id}", "description": "", "status": "active",
+                 "difficulty": 1, "priority": 1, "deadline": start + timedelta(hours=rng.randrange(24)), "user_id": 1}
+                for task_id in ids
+            ])
+            connection.execute(insert(Routine), [
+                {"id": task_id, "name": f"routine {task_id}", "frequency": rng.choice(frequencies),
+                 "count": rng.randint(1, 30), "task_id": task_id, "user_id": 1, "generated_count": 0}
+                for task_id in ids
+            ])
+
+
+async def materialize(until: datetime) -> int:
+    """
+    Сгенерировать повторения до until в одной транзакции (без ограничения MATERIALIZE_LIMIT).
+
+    Args:
+        until (datetime): Конец окна.
+
+    Returns:
+        int: Количество созданных задач.
+    """
+    async with open_session() as session:
+        ids = await materialize_occurrences(session, 1, until, limit=sys.maxsize)
+        await session.commit()
+    return len(ids)
+
+
+async def main(routines: int, days: int) -> None:
+    start = datetime(2026, 1, 1)
+    began = time.perf_counter()
+    seed(routines, start)
+    print(f"seed {routines} routines: {time.perf_counter() - began:.1f} s")
+    for label, until in (("first window", start + timedelta(days=days)),
+                         ("same window again", start + timedelta(days=days)),
+                         ("next window", start + timedelta(days=2 * days))):
+        began = time.perf_counter()
+        created = await materialize(until)
+        elapsed = time.perf_counter() - began
+        print(f"{label:>18}: {created:>8} tasks in {elapsed:.2f} s ({created / elapsed:,.0f} tasks/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routines", type=int, default=100000, help="количество рутин")
+    parser.add_argument("--days", type=int, default=7, help="ширина окна в днях")
+    args = parser.parse_args()
+    asyncio.run(main(args.routines, args.days))
@@ -0,0 +1,96 @@
+"""
+Бенчмарк планировщика напоминаний на большом числе неотправленных уведомлений.
+
+По умолчанию создаёт временную базу SQLite (или использует DB_URL) и заполняет её.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_scheduler --reminders 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_scheduler.sqlite3"))
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, select
+
+from connection import engine, open_session
+from models import Notification, Task, User
+from scheduler import NotificationScheduler
+
+
+def seed(reminders: int, horizon: timedelta, due: int) -> None:
+    """
+    Заполнить базу неотправленными напоминаниями.
+
+    Args:
+        reminders (int): Общее число напоминаний.
+        horizon (timedelta): Напоминания равномерно распределяются на этот срок вперёд.
+        due (int): Сколько напоминаний уже наступили.
+    """
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "name": "bench", "email": "bench@example.com", "password": "-"}])
+        connection.execute(insert(Task), [{"id": 1, "name": "bench", "description": "", "status": "active",
+                                           "difficulty": 1, "priority": 1, "deadline": now, "user_id": 1}])
+        for offset in range(0, reminders, 50000):
+            rows = []
+            for number in range(offset, min(offset + 50000, reminders)):
+                delay = -rng.random() * 60 if number < due else rng.random() * horizon.total_seconds()
+                rows.append({"user_id": 1, "task_id": 1, "remind_at": now + timedelta(seconds=delay)})
+            connection.execute(insert(Notification), rows)
+
+
+async def no_op(ids) -> None:
+    pass
+
+
+async def main(reminders: int, window: timedelta, horizon: timedelta, due: int) -> None:
+    started = time.perf_counter()
+    seed(reminders, horizon, due)
+    print(f"seed {reminders} reminders: {time.perf_counter() - started:.1f} s")
+
+    scheduler = NotificationScheduler(window=window, handler=no_op)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    await scheduler.load(now)
+    print(f"load window {window}: {len(scheduler)} reminders in heap, {time.perf_counter() - started:.3f} s")
+
+    count = 100000
+    started = time.perf_counter()
+    for number in range(count):
+        scheduler.schedule(10 ** 9 + number, now + window * random.random())
+    print(f"schedule: {count / (time.perf_counter() - started):,.0f} ops/s")
+    started = time.perf_counter()
+    for number in range(count):
+        scheduler.cancel(10 ** 9 + number)
+    print(f"cancel: {count / (time.perf_counter() - started):,.0f} ops/s")
+
+    started = time.perf_counter()
+    dispatched = 0
+    while batch := scheduler.pop_due(datetime.utcnow()):
+        dispatched += len(await scheduler.dispatch([notification_id for _, notification_id in batch]))
+    elapsed = time.perf_counter() - started
+    print(f"dispatch {dispatched} due reminders: {elapsed:.3f} s ({dispatched / max(elapsed, 1e-9):,.0f} /s)")
+
+    async with open_session() as session:
+        started = time.perf_counter()
+        pending = (await session.exec(select(Notification).where(Notification.dispatched_at.is_(None)))).all()
+        print(f"one polling cycle reading {len(pending)} pending rows: {time.perf_counter() - started:.3f} s "
+              f"(the scheduler issues no queries between window loads)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=1000000, help="число неотправленных напоминаний")
+    parser.add_argument("--due", type=int, default=10000, help="сколько из них уже наступили")
+    parser.add_argument("--window-minutes", type=float, default=60, help="ширина окна планировщика")
+    parser.add_argument("--horizon-days", type=float, default=30, help="на какой срок вперёд распределены напоминания")
+    args = parser.parse_args()
+    asyncio.run(main(args.reminders, timedelta(minutes=args.window_minutes),
+                     timedelta(days=args.horizon_days), args.due))
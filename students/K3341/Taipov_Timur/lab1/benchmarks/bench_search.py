@@ -0,0 +1,144 @@
+"""
+Бенчмарк полнотекстового поиска GET /tasks/search против поиска подстроки (LIKE).
+
+Таблица задач дозаполняется до каждого размера из --sizes текстом из случайных слов
+словаря; для редкого, среднего и частого слова замеряется медианная задержка первой
+страницы через индекс (FTS5 на SQLite, GIN на Postgres) и того же поиска через LIKE.
+LIKE не ранжирует результаты и останавливается на первых LIMIT совпадениях, поэтому
+для частых слов он быстрее; поиск по индексу выигрывает на редких словах и больших таблицах.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_search --sizes 10000,100000,300000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_search.sqlite3"))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("NOTIFICATION_SCHEDULER", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, or_, select, text
+from sqlmodel import SQLModel
+
+from auth import create_access_token
+from connection import engine
+from main import app
+from models import Task, User
+
+USERS = 10
+CHUNK_SIZE = 20000
+VOCABULARY = 20000
+LIMIT = 50
+
+
+def word(index: int) -> str:
+    """Слово словаря с номером index."""
+    return f"w{index:05d}"
+
+
+def seed(first: int, last: int, rng: random.Random) -> None:
+    """
+    Добавить задачи first..last с названием из 3 и описанием из 20 слов.
+
+    Номера слов распределены по Ципфу (частые слова встречаются часто), задачи — по
+    кругу между USERS пользователями.
+
+    Args:
+        first (int): Первый идентификатор задачи.
+        last (int): Последний идентификатор задачи.
+        rng (random.Random): Генератор случайных чисел.
+    """
+    weights = [1 / rank for rank in range(1, VOCABULARY + 1)]
+    with engine.begin() as connection:
+        if first == 1:
+            connection.execute(insert(User), [
+                {"id": user_id, "name": f"bench{user_id}", "email": f"bench{user_id}@example.com", "password": "-"}
+                for user_id in range(1, USERS + 1)
+            ])
+        for offset in range(first, last + 1, CHUNK_SIZE):
+            ids = range(offset, min(offset + CHUNK_SIZE - 1, last) + 1)
+            words = rng.choices(range(VOCABULARY), weights, k=23 * len(ids))
+            connection.execute(insert(Task), [
+                {"id": task_id, "name": " ".join(map(word, words[23 * n:23 * n + 3])),
+                 "description": " ".join(map(word, words[23 * n + 3:23 * n + 23])), "status": "active",
+                 "difficulty": 1, "priority": 1, "deadline": datetime(2026, 1, 1) + timedelta(minutes=task_id),
+                 "user_id": task_id % USERS + 1}
+                for n, task_id in enumerate(ids)
+            ])
+        connection.execute(text("ANALYZE"))
+
+
+def median_ms(fn, repeat: int) -> float:
+    """
+    Медианное время вызова fn в миллисекундах.
+
+    Args:
+        fn: Замеряемая функция без аргументов.
+        repeat (int): Число замеров.
+
+    Returns:
+        float: Медиана в миллисекундах.
+    """
+    fn()
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - began)
+    return statistics.median(timings) * 1000
+
+
+def like_search(term: str) -> int:
+    """
+    Найти задачи пользователя по подстроке без индекса (как без полнотекстового поиска).
+
+    Args:
+        term (str): Слово.
+
+    Returns:
+        int: Количество строк первой страницы.
+    """
+    pattern = f"%{term}%"
+    statement = (
+        select(Task.id)
+        .where(Task.user_id == 1, or_(Task.name.like(pattern), Task.description.like(pattern)))
+        .order_by(Task.id)
+        .limit(LIMIT)
+    )
+    with engine.connect() as connection:
+        return len(connection.execute(statement).all())
+
+
+def main(sizes: list[int], repeat: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench1'})}"}
+    terms = {"frequent": word(0), "medium": word(100), "rare": word(VOCABULARY - 1)}
+    loaded = 0
+    for size in sizes:
+        began = time.perf_counter()
+        seed(loaded + 1, size, rng)
+        loaded = size
+        print(f"seed up to {size} tasks: {time.perf_counter() - began:.1f} s")
+        print(f"{'rows':>9} {'term':>9} {'hits':>5} {'search ms':>10} {'LIKE ms':>9} {'speedup':>8}")
+        for label, term in terms.items():
+            params = {"q": term, "limit": LIMIT}
+            hits = len(client.get("/tasks/search", params=params, headers=headers).json()["items"])
+            search = median_ms(lambda: client.get("/tasks/search", params=params, headers=headers).raise_for_status(),
+                               repeat)
+            like = median_ms(lambda: like_search(term), repeat)
+            print(f"{size:>9} {label:>9} {hits:>5} {search:>10.2f} {like:>9.2f} {like / search:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,300000", help="размеры таблицы задач через запятую")
+    parser.add_argument("--repeat", type=int, default=10, help="число замеров на каждый запрос")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.repeat)
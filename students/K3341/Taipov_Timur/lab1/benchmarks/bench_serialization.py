@@ -0,0 +1,158 @@
+"""
+Бенчмарк сериализации списков: обычный путь (ORM + response_model) против FAST_JSON.
+
+Заполняет временную базу SQLite (или DB_URL) и для каждого роутера читает весь
+список постранично (limit=MAX_LIMIT), сначала обычным путём, затем быстрым.
+Кэш страниц проектов на время замера выключен.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_serialization --rows 5000 --repeat 5
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_serialization.sqlite3"))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("NOTIFICATION_SCHEDULER", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+
+import serialization
+from auth import create_access_token
+from connection import engine
+from main import app
+from models import Notification, Project, ProjectTaskLink, Routine, Tag, Task, TimeLog, User
+from pagination import MAX_LIMIT
+from response_cache import create_response_cache
+import routes.projects
+
+PATHS = ["/users/", "/projects/", "/tasks", "/timelogs/", "/routines/", "/tags/", "/notifications/"]
+TASKS_PER_PROJECT = 10
+
+
+def seed(rows: int) -> None:
+    """
+    Создать пользователей и по rows строк каждой коллекции первого пользователя.
+
+    Args:
+        rows (int): Количество строк в каждой коллекции.
+    """
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": user_id, "name": f"bench{user_id}", "email": f"bench{user_id}@example.com", "password": "-"}
+            for user_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Task), [
+            {"id": task_id, "name": f"task {task_id}", "description": "benchmark task", "status": "active",
+             "difficulty": rng.randint(1, 5), "priority": rng.randint(1, 5),
+             "deadline": start + timedelta(minutes=rng.randrange(525600)), "time_spent": rng.randrange(36000),
+             "user_id": 1}
+            for task_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Project), [
+            {"id": project_id, "name": f"project {project_id}", "description": "benchmark project", "user_id": 1}
+            for project_id in range(1, rows // TASKS_PER_PROJECT + 1)
+        ])
+        connection.execute(insert(ProjectTaskLink), [
+            {"project_id": (task_id - 1) // TASKS_PER_PROJECT + 1, "task_id": task_id}
+            for task_id in range(1, rows // TASKS_PER_PROJECT * TASKS_PER_PROJECT + 1)
+        ])
+        logs = []
+        for log_id in range(1, rows + 1):
+            begin = start + timedelta(minutes=rng.randrange(525600))
+            logs.append({"id": log_id, "task_id": rng.randint(1, rows), "user_id": 1,
+                         "start_time": begin, "end_time": begin + timedelta(minutes=rng.randint(5, 240))})
+        connection.execute(insert(TimeLog), logs)
+        connection.execute(insert(Routine), [
+            {"id": task_id, "name": f"routine {task_id}", "frequency": "daily", "count": 3, "task_id": task_id,
+             "user_id": 1, "generated_count": 0}
+            for task_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Tag), [
+            {"id": tag_id, "name": f"tag {tag_id}", "color": "red", "user_id": 1} for tag_id in range(1, rows + 1)
+        ])
+        connection.execute(insert(Notification), [
+            {"id": notification_id, "task_id": rng.randint(1, rows), "user_id": 1,
+             "remind_at": start + timedelta(minutes=rng.randrange(525600))}
+            for notification_id in range(1, rows + 1)
+        ])
+
+
+def read_all(client: TestClient, path: str, headers: dict) -> tuple[int, int]:
+    """
+    Прочитать весь список постранично.
+
+    Args:
+        client (TestClient): Клиент приложения.
+        path (str): Путь списка.
+        headers (dict): Заголовки авторизации.
+
+    Returns:
+        tuple[int, int]: Количество элементов и объём ответов в байтах.
+    """
+    items = size = 0
+    params = {"limit": MAX_LIMIT}
+    while True:
+        response = client.get(path, params=params, headers=headers)
+        response.raise_for_status()
+        page = response.json()
+        items += len(page["items"])
+        size += len(response.content)
+        if not page["next_cursor"]:
+            return items, size
+        params["cursor"] = page["next_cursor"]
+
+
+def measure(client: TestClient, path: str, headers: dict, repeat: int) -> tuple[float, int, int]:
+    """
+    Измерить лучшее время чтения всего списка из repeat попыток.
+
+    Args:
+        client (TestClient): Клиент приложения.
+        path (str): Путь списка.
+        headers (dict): Заголовки авторизации.
+        repeat (int): Число попыток.
+
+    Returns:
+        tuple[float, int, int]: Время в секундах, количество элементов и объём в байтах.
+    """
+    read_all(client, path, headers)
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        items, size = read_all(client, path, headers)
+        best = min(best, time.perf_counter() - began)
+    return best, items, size
+
+
+def main(rows: int, repeat: int) -> None:
+    began = time.perf_counter()
+    seed(rows)
+    print(f"seed {rows} rows per collection: {time.perf_counter() - began:.1f} s")
+    routes.projects.projects_cache = create_response_cache("none")
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench1'})}"}
+    print(f"{'path':>16} {'items':>7} {'KiB':>8} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for path in PATHS:
+        serialization.FAST_JSON = False
+        default, items, size = measure(client, path, headers, repeat)
+        serialization.FAST_JSON = True
+        fast, _, _ = measure(client, path, headers, repeat)
+        print(f"{path:>16} {items:>7} {size / 1024:>8.0f} {default * 1000:>11.1f} {fast * 1000:>9.1f} "
+              f"{default / fast:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000, help="количество строк в каждой коллекции")
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров на каждый путь")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,148 @@
+"""
+Бенчмарк фильтров и сортировок GET /tasks при росте таблицы задач.
+
+Таблица дозаполняется до каждого размера из --sizes (по умолчанию до миллиона строк;
+десятая часть задач принадлежит замеряемому пользователю), после чего для каждого
+набора параметров замеряется медианная задержка первой страницы и страницы по курсору.
+При индексах задержка не должна расти вместе с таблицей.
+Запуск из каталога lab1:
+    python -m benchmarks.bench_task_filters --sizes 10000,100000,1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DB_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_task_filters.sqlite3"))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("NOTIFICATION_SCHEDULER", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+from sqlmodel import SQLModel
+
+from auth import create_access_token
+from connection import engine
+from main import app
+from models import Project, ProjectTaskLink, Tag, TagTaskLink, Task, TaskStatus, User
+
+USERS = 10
+TASKS_PER_GROUP = 100
+CHUNK_SIZE = 50000
+START = datetime(2026, 1, 1)
+QUERIES = {
+    "default": {},
+    "status": {"status": "active"},
+    "deadline window": {"deadline_after": "2026-03-01T00:00:00", "deadline_before": "2026-03-08T00:00:00"},
+    "status + window": {"status": "active", "deadline_after": "2026-03-01T00:00:00",
+                        "deadline_before": "2026-03-08T00:00:00"},
+    "-deadline": {"sort": "-deadline"},
+    "priority": {"sort": "priority"},
+    "priority range": {"sort": "priority", "priority_min": 4, "priority_max": 5},
+    "project": {"project_id": 1},
+    "tag": {"tag_id": 1},
+    "tags any": {"tags_any": [1, 11, 21]},
+    "tags all": {"tags_all": [1, 11]},
+    "tags none": {"tags_none": [1, 11, 21]},
+}
+
+
+def seed(first: int, last: int, rng: random.Random) -> None:
+    """
+    Добавить задачи с идентификаторами first..last, их проекты, теги и связи.
+
+    Каждые TASKS_PER_GROUP подряд идущих задач образуют группу: у них один владелец,
+    один проект и один тег. Группы по кругу распределены между USERS пользователями.
+
+    Args:
+        first (int): Первый идентификатор задачи.
+        last (int): Последний идентификатор задачи.
+        rng (random.Random): Генератор случайных чисел.
+    """
+    statuses = list(TaskStatus)
+    with engine.begin() as connection:
+        if first == 1:
+            connection.execute(insert(User), [
+                {"id": user_id, "name": f"bench{user_id}", "email": f"bench{user_id}@example.com", "password": "-"}
+                for user_id in range(1, USERS + 1)
+            ])
+        for offset in range(first, last + 1, CHUNK_SIZE):
+            ids = range(offset, min(offset + CHUNK_SIZE - 1, last) + 1)
+            groups = [(task_id - 1) // TASKS_PER_GROUP + 1 for task_id in ids if (task_id - 1) % TASKS_PER_GROUP == 0]
+            if groups:
+                connection.execute(insert(Project), [
+                    {"id": group, "name": f"project {group}", "description": "", "user_id": (group - 1) % USERS + 1}
+                    for group in groups
+                ])
+                connection.execute(insert(Tag), [
+                    {"id": group, "name": f"tag {group}", "color": "red", "user_id": (group - 1) % USERS + 1}
+                    for group in groups
+                ])
+            connection.execute(insert(Task), [
+                {"id": task_id, "name": f"task {task_id}", "description": "benchmark task " * 8,
+                 "status": rng.choice(statuses), "difficulty": rng.randint(1, 5), "priority": rng.randint(1, 5),
+                 "deadline": START + timedelta(minutes=rng.randrange(525600)),
+                 "user_id": (task_id - 1) // TASKS_PER_GROUP % USERS + 1}
+                for task_id in ids
+            ])
+            connection.execute(insert(ProjectTaskLink), [
+                {"task_id": task_id, "project_id": (task_id - 1) // TASKS_PER_GROUP + 1} for task_id in ids
+            ])
+            connection.execute(insert(TagTaskLink), [
+                {"task_id": task_id, "tag_id": (task_id - 1) // TASKS_PER_GROUP + 1} for task_id in ids
+            ])
+        connection.execute(text("ANALYZE"))
+
+
+def latency(client: TestClient, params: dict, headers: dict, repeat: int) -> tuple[float, float]:
+    """
+    Измерить медианную задержку первой и второй страницы.
+
+    Args:
+        client (TestClient): Клиент приложения.
+        params (dict): Параметры запроса.
+        headers (dict): Заголовки авторизации.
+        repeat (int): Число замеров.
+
+    Returns:
+        tuple[float, float]: Задержки первой страницы и страницы по курсору в миллисекундах.
+    """
+    first, second = [], []
+    cursor = client.get("/tasks", params=params, headers=headers).json()["next_cursor"]
+    for _ in range(repeat):
+        began = time.perf_counter()
+        client.get("/tasks", params=params, headers=headers).raise_for_status()
+        first.append(time.perf_counter() - began)
+        if cursor:
+            began = time.perf_counter()
+            client.get("/tasks", params={**params, "cursor": cursor}, headers=headers).raise_for_status()
+            second.append(time.perf_counter() - began)
+    return statistics.median(first) * 1000, statistics.median(second or [0]) * 1000
+
+
+def main(sizes: list[int], repeat: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench1'})}"}
+    loaded = 0
+    print(f"{'rows':>9} {'query':>16} {'page 1 ms':>10} {'page 2 ms':>10}")
+    for size in sizes:
+        began = time.perf_counter()
+        seed(loaded + 1, size, rng)
+        print(f"seed up to {size} tasks: {time.perf_counter() - began:.1f} s")
+        loaded = size
+        for label, params in QUERIES.items():
+            first, second = latency(client, params, headers, repeat)
+            print(f"{size:>9} {label:>16} {first:>10.2f} {second:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="размеры таблицы задач через запятую")
+    parser.add_argument("--repeat", type=int, default=20, help="число замеров на каждый запрос")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.repeat)
@@ -1,14 +1,175 @@
+from contextlib import asynccontextmanager
+
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 import os
 load_dotenv()
 
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 db_url = os.getenv("DB_URL")
+async_db = os.getenv("ASYNC_DB", "0") == "1"
 engine = create_engine(db_url)
+dialect_name = engine.dialect.name
+
+
+def get_async_url(url: str) -> str:
+    """
+    Получить адрес базы данных с асинхронным драйвером.
+
+    Args:
+        url (str): Адрес базы данных с синхронным драйвером (как в DB_URL).
+
+    Returns:
+        str: Адрес с драйвером asyncpg для Postgres или aiosqlite для SQLite.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def dialect_insert(table):
+    """
+    Построить INSERT для диалекта текущей базы данных.
+
+    В отличие от общего insert, поддерживает on_conflict_do_update (Postgres и SQLite).
+
+    Args:
+        table: Табличная модель или таблица.
+
+    Returns:
+        Insert: Запрос INSERT.
+    """
+    return (postgresql if dialect_name == "postgresql" else sqlite).insert(table)
+
+
+async_engine = create_async_engine(os.getenv("ASYNC_DB_URL") or get_async_url(db_url)) if async_db else None
+
+
+class ThreadedSession:
+    """
+    Асинхронный интерфейс поверх синхронной сессии.
+
+    Используется, когда ASYNC_DB выключен: обработчики написаны как async def
+    для обоих режимов, а блокирующие обращения к базе выполняются в пуле потоков.
+    Методы повторяют интерфейс AsyncSession.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def exec(self, statement, **kwargs):
+        kwargs.setdefault("execution_options", {"prebuffer_rows": True})
+        return await run_in_threadpool(self.sync_session.exec, statement, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        kwargs.setdefault("execution_options", {"prebuffer_rows": True})
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def stream_partitions(statement, size: int = 1000):
+    """
+    Выполнить запрос через серверный курсор и отдавать строки пачками.
+
+    Использует собственное соединение, а не сессию запроса, поэтому подходит
+    для StreamingResponse, который читается уже после выхода из зависимостей.
+
+    Args:
+        statement: Запрос select (Core, по колонкам).
+        size (int): Размер пачки (yield_per).
+
+    Yields:
+        list: Очередная пачка строк.
+    """
+    statement = statement.execution_options(yield_per=size)
+    if async_db:
+        async with async_engine.connect() as connection:
+            result = await connection.stream(statement)
+            async for partition in result.partitions():
+                yield partition
+        return
+    connection = await run_in_threadpool(engine.connect)
+    try:
+        result = await run_in_threadpool(connection.execute, statement)
+        partitions = result.partitions()
+        while partition := await run_in_threadpool(next, partitions, None):
+            yield partition
+    finally:
+        await run_in_threadpool(connection.close)
+
 
 def init_db():
     SQLModel.metadata.create_all(engine)
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+
+@asynccontextmanager
+async def open_session():
+    """
+    Открыть сессию базы данных в текущем режиме (ASYNC_DB).
+
+    Используется вне запросов, например фоновыми задачами.
+
+    Yields:
+        AsyncSession | ThreadedSession: Сессия базы данных.
+    """
+    if async_db:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+    else:
+        session = ThreadedSession(Session(engine, expire_on_commit=False))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_session():
+    """
+    Получить сессию базы данных на время запроса.
+
+    При ASYNC_DB=1 выдаётся AsyncSession поверх asyncpg/aiosqlite, иначе
+    синхронная Session, обёрнутая в ThreadedSession.
+
+    Yields:
+        AsyncSession | ThreadedSession: Сессия базы данных.
+    """
+    async with open_session() as session:
+        yield session
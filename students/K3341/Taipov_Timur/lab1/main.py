@@ -1,7 +1,25 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from routes import tasks, users, projects, tags, timelogs, routines, notifications
 
-app = FastAPI()
+from auth import hash_pool
+from metrics import METRICS, MetricsMiddleware
+from query_stats import QUERY_STATS, QueryStatsMiddleware
+from profiling import PROFILING, ProfilingMiddleware
+from scheduler import notification_scheduler, NOTIFICATION_SCHEDULER
+from routes import tasks, users, projects, tags, timelogs, routines, notifications, metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if NOTIFICATION_SCHEDULER:
+        notification_scheduler.start()
+    yield
+    await notification_scheduler.stop()
+    hash_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(tasks.router)
 app.include_router(users.router)
@@ -10,3 +28,11 @@ app.include_router(tags.router)
 app.include_router(timelogs.router)
 app.include_router(routines.router)
 app.include_router(notifications.router)
+
+if METRICS:
+    app.include_router(metrics.router)
+    app.add_middleware(MetricsMiddleware, routes=app.routes)
+if QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+if PROFILING:
+    app.add_middleware(ProfilingMiddleware)
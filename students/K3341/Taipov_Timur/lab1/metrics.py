@@ -0,0 +1,247 @@
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from dotenv import load_dotenv
+
+from connection import async_engine, engine
+
+load_dotenv()
+
+METRICS = os.getenv("METRICS", "1") == "1"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+POOL_GAUGES = {
+    "size": "Размер пула соединений",
+    "checkedout": "Соединений, выданных из пула",
+    "checkedin": "Свободных соединений в пуле",
+    "overflow": "Соединений сверх размера пула",
+}
+UNMATCHED = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин.
+
+    Attributes:
+        buckets (tuple): Верхние границы корзин по возрастанию.
+        counts (list): Наблюдений в каждой корзине (последняя — выше всех границ).
+        sum (float): Сумма наблюдений.
+        count (int): Число наблюдений.
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """
+    Метрики запросов по шаблонам маршрутов.
+
+    Обновляются только из цикла событий (middleware), поэтому обходятся без блокировок.
+
+    Attributes:
+        requests (dict): Число ответов по (метод, маршрут, статус).
+        in_progress (dict): Выполняющихся запросов по (метод, маршрут).
+        latency (dict): Гистограммы длительности по (метод, маршрут).
+        sizes (dict): Гистограммы размера ответа по (метод, маршрут).
+    """
+
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.in_progress = defaultdict(int)
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.sizes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        """
+        Учесть завершённый запрос.
+
+        Args:
+            method (str): HTTP-метод.
+            route (str): Шаблон маршрута, например /tasks/{task_id}.
+            status (int): Код ответа.
+            seconds (float): Длительность обработки.
+            size (int): Размер тела ответа в байтах.
+        """
+        self.requests[(method, route, status)] += 1
+        self.latency[(method, route)].observe(seconds)
+        self.sizes[(method, route)].observe(size)
+
+    def render(self) -> str:
+        """
+        Вывести метрики запросов и пула соединений в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст для эндпоинта /metrics.
+        """
+        lines = [
+            "# HELP http_requests_total Число обработанных запросов",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in self.requests.items():
+            lines.append(f"http_requests_total{labels(method=method, route=route, status=status)} {value}")
+        lines += [
+            "# HELP http_requests_in_progress Число выполняющихся запросов",
+            "# TYPE http_requests_in_progress gauge",
+        ]
+        for (method, route), value in self.in_progress.items():
+            lines.append(f"http_requests_in_progress{labels(method=method, route=route)} {value}")
+        render_histograms(lines, "http_request_duration_seconds", "Длительность обработки запроса в секундах",
+                          self.latency)
+        render_histograms(lines, "http_response_size_bytes", "Размер тела ответа в байтах", self.sizes)
+        render_pools(lines)
+        return "\n".join(lines) + "\n"
+
+
+def escape(value) -> str:
+    """Экранировать значение метки Prometheus."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def labels(**values) -> str:
+    """Отформатировать метки Prometheus."""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in values.items()) + "}"
+
+
+def render_histograms(lines: list, name: str, description: str, histograms: dict) -> None:
+    """
+    Добавить к выводу гистограммы (кумулятивные корзины, сумму и число наблюдений).
+
+    Args:
+        lines (list): Строки вывода.
+        name (str): Имя метрики.
+        description (str): Описание для HELP.
+        histograms (dict): Гистограммы по (метод, маршрут).
+    """
+    lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in histograms.items():
+        total = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+            total += count
+            lines.append(f"{name}_bucket{labels(method=method, route=route, le=bound)} {total}")
+        lines.append(f"{name}_sum{labels(method=method, route=route)} {histogram.sum}")
+        lines.append(f"{name}_count{labels(method=method, route=route)} {histogram.count}")
+
+
+def render_pools(lines: list) -> None:
+    """
+    Добавить к выводу показатели пулов соединений синхронного и асинхронного движков.
+
+    Значения снимаются в момент запроса /metrics, поэтому на обработку запросов не влияют.
+    Пулы без таких показателей (например, SingletonThreadPool для SQLite в памяти) пропускаются.
+
+    Args:
+        lines (list): Строки вывода.
+    """
+    pools = {"sync": engine.pool}
+    if async_engine is not None:
+        pools["async"] = async_engine.sync_engine.pool
+    for method, description in POOL_GAUGES.items():
+        values = [(name, getattr(pool, method)()) for name, pool in pools.items() if hasattr(pool, method)]
+        if values:
+            lines += [f"# HELP db_pool_{method} {description}", f"# TYPE db_pool_{method} gauge"]
+            lines += [f"db_pool_{method}{labels(engine=name)} {value}" for name, value in values]
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware, собирающий метрики запросов по шаблонам маршрутов.
+
+    Шаблон (/tasks/{task_id}, а не /tasks/42) определяется по регулярным выражениям
+    маршрутов приложения до вызова обработчика, чтобы число выполняющихся запросов тоже было по
+    маршрутам, а число рядов метрик не зависело от идентификаторов в путях. Запросы к
+    несуществующим путям учитываются под маршрутом <unmatched>.
+
+    Args:
+        app: Следующее ASGI-приложение.
+        routes (list): Маршруты приложения (app.routes).
+        metrics (RequestMetrics): Хранилище метрик.
+    """
+
+    def __init__(self, app, routes: list, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.routes = routes
+        self.metrics = metrics
+        self.index = None
+
+    def build_index(self) -> dict:
+        """
+        Сгруппировать маршруты по первому сегменту пути.
+
+        Запрос сверяется только с регулярными выражениями своей группы и маршрутов,
+        путь которых начинается с параметра, а не со всеми маршрутами приложения.
+
+        Returns:
+            dict: Первый сегмент (или None для параметра) -> [(регулярное выражение, методы, шаблон)].
+        """
+        index = defaultdict(list)
+        for route in self.routes:
+            if hasattr(route, "path_regex"):
+                segment = route.path.split("/")[1]
+                index[None if segment.startswith("{") else segment].append(
+                    (route.path_regex, getattr(route, "methods", None), route.path)
+                )
+        return dict(index)
+
+    def route_template(self, method: str, path: str) -> str:
+        """
+        Найти шаблон маршрута запроса.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса.
+
+        Returns:
+            str: Путь маршрута с параметрами, маршрут с тем же путём и другим методом или <unmatched>.
+        """
+        if self.index is None:
+            self.index = self.build_index()
+        partial = UNMATCHED
+        for group in (path.split("/", 2)[1], None):
+            for regex, methods, template in self.index.get(group, ()):
+                if regex.match(path):
+                    if methods is None or method in methods:
+                        return template
+                    if partial is UNMATCHED:
+                        partial = template
+        return partial
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self.route_template(method, scope["path"])
+        status, size = 500, 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_progress[(method, route)] += 1
+        began = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self.metrics.in_progress[(method, route)] -= 1
+            self.metrics.observe(method, route, status, time.perf_counter() - began, size)
@@ -8,6 +8,7 @@ from sqlmodel import SQLModel
 from dotenv import load_dotenv
 import os
 import models
+import search
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -52,6 +53,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=search.include_object,
     )
 
     with context.begin_transaction():
@@ -73,7 +75,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=search.include_object,
         )
 
         with context.begin_transaction():
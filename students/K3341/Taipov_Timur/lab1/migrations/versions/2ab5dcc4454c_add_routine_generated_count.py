@@ -0,0 +1,28 @@
+"""add routine generated_count
+
+Revision ID: 2ab5dcc4454c
+Revises: cdeae5c65cb4
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ab5dcc4454c'
+down_revision: Union[str, None] = 'cdeae5c65cb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('routine', sa.Column('generated_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('routine', 'generated_count')
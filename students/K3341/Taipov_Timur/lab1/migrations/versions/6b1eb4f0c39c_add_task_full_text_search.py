@@ -0,0 +1,57 @@
+"""add task full text search
+
+Revision ID: 6b1eb4f0c39c
+Revises: 93eb7746aa6f
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1eb4f0c39c'
+down_revision: Union[str, None] = '93eb7746aa6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # generated column: filled for existing rows and kept in sync by Postgres itself
+        op.execute(
+            "ALTER TABLE task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED"
+        )
+        op.execute("CREATE INDEX ix_task_search_vector ON task USING gin (search_vector)")
+        return
+    op.execute("CREATE VIRTUAL TABLE task_fts USING fts5(name, description, content='task', content_rowid='id')")
+    op.execute(
+        "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+        "INSERT INTO task_fts (rowid, name, description) VALUES (new.id, new.name, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+        "INSERT INTO task_fts (task_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_fts_update AFTER UPDATE OF name, description ON task BEGIN "
+        "INSERT INTO task_fts (task_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO task_fts (rowid, name, description) VALUES (new.id, new.name, new.description); END"
+    )
+    op.execute("INSERT INTO task_fts (task_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_task_search_vector', table_name='task')
+        op.drop_column('task', 'search_vector')
+        return
+    for trigger in ('task_fts_update', 'task_fts_delete', 'task_fts_insert'):
+        op.execute(f"DROP TRIGGER {trigger}")
+    op.drop_table('task_fts')
@@ -0,0 +1,34 @@
+"""add collectionversion table
+
+Revision ID: 8aa5b62f0b26
+Revises: 2ab5dcc4454c
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8aa5b62f0b26'
+down_revision: Union[str, None] = '2ab5dcc4454c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('collectionversion',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('collection', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'collection')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('collectionversion')
@@ -0,0 +1,30 @@
+"""add task filter indexes
+
+Revision ID: 93eb7746aa6f
+Revises: 8aa5b62f0b26
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93eb7746aa6f'
+down_revision: Union[str, None] = '8aa5b62f0b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_user_id_status_deadline_id', 'task', ['user_id', 'status', 'deadline', 'id'], unique=False)
+    op.create_index('ix_task_user_id_priority_id', 'task', ['user_id', 'priority', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_user_id_priority_id', table_name='task')
+    op.drop_index('ix_task_user_id_status_deadline_id', table_name='task')
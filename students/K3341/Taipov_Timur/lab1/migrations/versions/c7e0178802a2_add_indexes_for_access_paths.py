@@ -0,0 +1,43 @@
+"""add indexes for access paths
+
+Revision ID: c7e0178802a2
+Revises: b5bdfef7652c
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e0178802a2'
+down_revision: Union[str, None] = 'b5bdfef7652c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_task_user_id_deadline_id', 'task', ['user_id', 'deadline', 'id']),
+    ('ix_project_user_id_id', 'project', ['user_id', 'id']),
+    ('ix_tag_user_id_id', 'tag', ['user_id', 'id']),
+    ('ix_routine_user_id_id', 'routine', ['user_id', 'id']),
+    ('ix_timelog_user_id_start_time_id', 'timelog', ['user_id', 'start_time', 'id']),
+    ('ix_timelog_task_id_start_time', 'timelog', ['task_id', 'start_time']),
+    ('ix_notification_user_id_remind_at_id', 'notification', ['user_id', 'remind_at', 'id']),
+    ('ix_notification_task_id', 'notification', ['task_id']),
+    ('ix_projecttasklink_project_id_task_id', 'projecttasklink', ['project_id', 'task_id']),
+    ('ix_tagtasklink_tag_id_task_id', 'tagtasklink', ['tag_id', 'task_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""add timelogdaily rollup table
+
+Revision ID: c8c80a7a23ef
+Revises: c7e0178802a2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8c80a7a23ef'
+down_revision: Union[str, None] = 'c7e0178802a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('timelogdaily',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('seconds', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'task_id', 'day')
+    )
+    op.create_index('ix_timelogdaily_user_id_day', 'timelogdaily', ['user_id', 'day'], unique=False)
+    # existing time logs are loaded with: python -m scripts.rebuild_timelog_daily
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_timelogdaily_user_id_day', table_name='timelogdaily')
+    op.drop_table('timelogdaily')
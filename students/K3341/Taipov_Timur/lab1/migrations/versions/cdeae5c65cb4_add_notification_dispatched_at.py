@@ -0,0 +1,32 @@
+"""add notification dispatched_at
+
+Revision ID: cdeae5c65cb4
+Revises: c8c80a7a23ef
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+import sqlmodel
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cdeae5c65cb4'
+down_revision: Union[str, None] = 'c8c80a7a23ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notification', sa.Column('dispatched_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_notification_pending_remind_at', 'notification', ['remind_at'], unique=False,
+                    sqlite_where=sa.text('dispatched_at IS NULL'), postgresql_where=sa.text('dispatched_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_pending_remind_at', table_name='notification',
+                  sqlite_where=sa.text('dispatched_at IS NULL'), postgresql_where=sa.text('dispatched_at IS NULL'))
+    op.drop_column('notification', 'dispatched_at')
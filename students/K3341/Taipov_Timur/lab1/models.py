@@ -1,5 +1,6 @@
-from datetime import datetime, time
+from datetime import date, datetime, time
 from enum import Enum
+from sqlalchemy import DDL, Index, event, text
 from sqlmodel import SQLModel, Field, Relationship
 from typing import List, Optional
 
@@ -60,6 +61,34 @@ class User(UserDefault, table=True):
     tasks: List["Task"] = Relationship(back_populates="user")
 
 
+class UserPage(SQLModel):
+    """
+    Страница списка пользователей.
+
+    Attributes:
+        items (List[UserRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[UserRead]
+    next_cursor: Optional[str] = None
+
+
+class CollectionVersion(SQLModel, table=True):
+    """
+    Версия коллекции пользователя (задачи, проекты, теги и т.д.).
+
+    Увеличивается каждым изменением коллекции и используется для ETag списков.
+
+    Attributes:
+        user_id (int): Владелец коллекции.
+        collection (str): Название коллекции.
+        version (int): Номер версии.
+    """
+    user_id: int = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    collection: str = Field(primary_key=True)
+    version: int = 0
+
+
 class UserLogin(SQLModel):
     """
     Модель для авторизации пользователя.
@@ -76,6 +105,8 @@ class ProjectTaskLink(SQLModel, table=True):
     """
     Промежуточная таблица для связи задач и проектов.
     """
+    __table_args__ = (Index("ix_projecttasklink_project_id_task_id", "project_id", "task_id"),)
+
     task_id: int = Field(default=None, foreign_key="task.id", primary_key=True)
     project_id: int = Field(default=None, foreign_key="project.id", primary_key=True)
 
@@ -120,16 +151,66 @@ class Project(ProjectDefault, table=True):
         user (User): Владелец проекта.
         tasks (List[Task]): Связанные задачи.
     """
+    __table_args__ = (Index("ix_project_user_id_id", "user_id", "id"),)
+
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     user: Optional[User] = Relationship(back_populates="projects")
     tasks: List["Task"] = Relationship(back_populates="projects", link_model=ProjectTaskLink)
 
 
+class ProjectPage(SQLModel):
+    """
+    Страница списка проектов.
+
+    Attributes:
+        items (List[ProjectRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[ProjectRead]
+    next_cursor: Optional[str] = None
+
+
+class ProjectSummary(ProjectDefault):
+    """
+    Проект со сводкой по задачам вместо самих задач.
+
+    Attributes:
+        id (int): Идентификатор проекта.
+        task_count (int): Всего задач.
+        active_count (int): Активных задач.
+        completed_count (int): Завершённых задач.
+        archived_count (int): Архивированных задач.
+        nearest_deadline (Optional[datetime]): Ближайший срок среди активных задач.
+        time_spent (int): Суммарное потраченное время в секундах.
+    """
+    id: int
+    task_count: int = 0
+    active_count: int = 0
+    completed_count: int = 0
+    archived_count: int = 0
+    nearest_deadline: Optional[datetime] = None
+    time_spent: int = 0
+
+
+class ProjectSummaryPage(SQLModel):
+    """
+    Страница сводок по проектам.
+
+    Attributes:
+        items (List[ProjectSummary]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+
+
 class TagTaskLink(SQLModel, table=True):
     """
     Промежуточная таблица для связи задач и тегов.
     """
+    __table_args__ = (Index("ix_tagtasklink_tag_id_task_id", "tag_id", "task_id"),)
+
     task_id: int = Field(default=None, foreign_key="task.id", primary_key=True)
     tag_id: int = Field(default=None, foreign_key="tag.id", primary_key=True)
 
@@ -184,7 +265,7 @@ class TaskRead(TaskDefault):
 
     Attributes:
         id (int): Идентификатор задачи.
-        time_spent (Optional[int]): Время, потраченное на задачу.
+        time_spent (Optional[int]): Время, потраченное на задачу, в секундах.
         user_id (int): Владелец задачи.
     """
     id: int
@@ -198,12 +279,18 @@ class Task(TaskDefault, table=True):
 
     Attributes:
         id (int): Первичный ключ.
-        time_spent (Optional[int]): Потраченное время.
+        time_spent (Optional[int]): Потраченное время в секундах (сумма по TimeLog).
         user (User): Владелец задачи.
         projects (List[Project]): Связанные проекты.
         routine (Optional[Routine]): Связанная рутина.
         tags (List[Tag]): Теги.
     """
+    __table_args__ = (
+        Index("ix_task_user_id_deadline_id", "user_id", "deadline", "id"),
+        Index("ix_task_user_id_status_deadline_id", "user_id", "status", "deadline", "id"),
+        Index("ix_task_user_id_priority_id", "user_id", "priority", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     time_spent: Optional[int] = None
     user_id: int = Field(foreign_key="user.id")
@@ -213,6 +300,44 @@ class Task(TaskDefault, table=True):
     tags: List["Tag"] = Relationship(back_populates="tasks", link_model=TagTaskLink)
 
 
+# Полнотекстовый поиск по задачам (см. search.py): на Postgres — генерируемая колонка
+# search_vector с GIN-индексом, на SQLite — внешняя таблица FTS5 с триггерами синхронизации.
+TASK_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX ix_task_search_vector ON task USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE task_fts USING fts5(name, description, content='task', content_rowid='id')",
+        "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+        "INSERT INTO task_fts (rowid, name, description) VALUES (new.id, new.name, new.description); END",
+        "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+        "INSERT INTO task_fts (task_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END",
+        "CREATE TRIGGER task_fts_update AFTER UPDATE OF name, description ON task BEGIN "
+        "INSERT INTO task_fts (task_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO task_fts (rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    ],
+}
+for dialect, statements in TASK_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(Task.__table__, "before_drop", DDL("DROP TABLE IF EXISTS task_fts").execute_if(dialect="sqlite"))
+
+
+class TaskPage(SQLModel):
+    """
+    Страница списка задач.
+
+    Attributes:
+        items (List[TaskRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[TaskRead]
+    next_cursor: Optional[str] = None
+
+
 class TimeLogDefault(SQLModel):
     """
     Базовая модель записи учёта времени.
@@ -251,9 +376,61 @@ class TimeLog(TimeLogDefault, table=True):
     Attributes:
         id (int): Первичный ключ.
     """
+    __table_args__ = (
+        Index("ix_timelog_user_id_start_time_id", "user_id", "start_time", "id"),
+        Index("ix_timelog_task_id_start_time", "task_id", "start_time"),
+    )
+
     id: int = Field(default=None, primary_key=True)
 
 
+class TimeLogDaily(SQLModel, table=True):
+    """
+    Дневной итог учёта времени по задаче.
+
+    Обновляется инкрементально при создании и удалении TimeLog; запись,
+    пересекающая полночь, делится между днями.
+
+    Attributes:
+        user_id (int): Владелец записей.
+        task_id (int): Задача.
+        day (date): День.
+        seconds (int): Суммарное время за день в секундах.
+    """
+    __table_args__ = (Index("ix_timelogdaily_user_id_day", "user_id", "day"),)
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    task_id: int = Field(foreign_key="task.id", primary_key=True, ondelete="CASCADE")
+    day: date = Field(primary_key=True)
+    seconds: int = 0
+
+
+class TimeLogStat(SQLModel):
+    """
+    Строка статистики учёта времени.
+
+    Attributes:
+        bucket (Optional[date]): Начало периода (дня, недели, месяца, года) или None для итога.
+        key (Optional[int]): Идентификатор задачи, проекта или тега, либо None без группировки.
+        seconds (int): Суммарное время в секундах.
+    """
+    bucket: Optional[date] = None
+    key: Optional[int] = None
+    seconds: int
+
+
+class TimeLogPage(SQLModel):
+    """
+    Страница списка записей учёта времени.
+
+    Attributes:
+        items (List[TimeLogRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[TimeLogRead]
+    next_cursor: Optional[str] = None
+
+
 class RoutineType(str, Enum):
     """
     Частота выполнения рутины.
@@ -300,8 +477,10 @@ class RoutineRead(RoutineDefault):
 
     Attributes:
         id (int): Идентификатор.
+        generated_count (int): Сколько повторений уже создано задачами.
     """
     id: int
+    generated_count: int = 0
 
 
 class Routine(RoutineDefault, table=True):
@@ -311,13 +490,43 @@ class Routine(RoutineDefault, table=True):
     Attributes:
         id (int): Первичный ключ.
         user_id (int): Владелец.
+        generated_count (int): Отметка уровня: номер последнего созданного повторения.
         task (Optional[Task]): Связанная задача.
     """
+    __table_args__ = (Index("ix_routine_user_id_id", "user_id", "id"),)
+
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
+    generated_count: int = Field(default=0)
     task: Optional["Task"] = Relationship(back_populates="routine")
 
 
+class RoutineOccurrence(SQLModel):
+    """
+    Повторение рутины.
+
+    Attributes:
+        index (int): Номер повторения (1..count).
+        deadline (datetime): Срок задачи этого повторения.
+        materialized (bool): Создана ли уже задача для этого повторения.
+    """
+    index: int
+    deadline: datetime
+    materialized: bool
+
+
+class RoutinePage(SQLModel):
+    """
+    Страница списка рутин.
+
+    Attributes:
+        items (List[RoutineRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[RoutineRead]
+    next_cursor: Optional[str] = None
+
+
 class TagDefault(SQLModel):
     """
     Базовая модель тега.
@@ -355,10 +564,24 @@ class Tag(TagDefault, table=True):
         id (int): Первичный ключ.
         tasks (List[Task]): Связанные задачи.
     """
+    __table_args__ = (Index("ix_tag_user_id_id", "user_id", "id"),)
+
     id: int = Field(default=None, primary_key=True)
     tasks: List["Task"] = Relationship(back_populates="tags", link_model=TagTaskLink)
 
 
+class TagPage(SQLModel):
+    """
+    Страница списка тегов.
+
+    Attributes:
+        items (List[TagRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[TagRead]
+    next_cursor: Optional[str] = None
+
+
 class NotificationDefault(SQLModel):
     """
     Базовая модель уведомления.
@@ -384,8 +607,10 @@ class NotificationRead(NotificationDefault):
 
     Attributes:
         id (int): Идентификатор.
+        dispatched_at (Optional[datetime]): Время отправки напоминания.
     """
     id: int
+    dispatched_at: Optional[datetime] = None
 
 
 class Notification(NotificationDefault, table=True):
@@ -394,6 +619,26 @@ class Notification(NotificationDefault, table=True):
 
     Attributes:
         id (int): Первичный ключ.
+        dispatched_at (Optional[datetime]): Время отправки напоминания (None, пока не отправлено).
     """
+    __table_args__ = (
+        Index("ix_notification_user_id_remind_at_id", "user_id", "remind_at", "id"),
+        Index("ix_notification_task_id", "task_id"),
+        Index("ix_notification_pending_remind_at", "remind_at",
+              sqlite_where=text("dispatched_at IS NULL"), postgresql_where=text("dispatched_at IS NULL")),
+    )
+
     id: int = Field(default=None, primary_key=True)
+    dispatched_at: Optional[datetime] = None
 
+
+class NotificationPage(SQLModel):
+    """
+    Страница списка уведомлений.
+
+    Attributes:
+        items (List[NotificationRead]): Элементы страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы или None, если страница последняя.
+    """
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
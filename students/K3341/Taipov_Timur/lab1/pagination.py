@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def encode_cursor(values: Sequence) -> str:
+    """
+    Закодировать значения ключа сортировки в непрозрачный курсор.
+
+    Args:
+        values (Sequence): Значения колонок сортировки последней строки страницы.
+
+    Returns:
+        str: Курсор в base64url.
+    """
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    """
+    Раскодировать курсор в значения колонок сортировки.
+
+    Args:
+        cursor (str): Курсор, полученный клиентом в next_cursor.
+        columns (Sequence): Колонки сортировки.
+
+    Returns:
+        list: Значения колонок, приведённые к их типам.
+
+    Raises:
+        HTTPException: Если курсор повреждён или не подходит к этому списку.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(session, statement, order_by: Sequence, cursor: Optional[str], limit: int,
+                   descending: bool = False) -> dict:
+    """
+    Получить одну страницу выборки с keyset-пагинацией.
+
+    Страница начинается строго после строки, закодированной в курсоре, поэтому
+    стоимость запроса не зависит от номера страницы (в отличие от OFFSET).
+    Последняя колонка order_by должна быть уникальной (обычно id).
+
+    Args:
+        session (Session): Сессия базы данных.
+        statement: Запрос select без сортировки и лимита.
+        order_by (Sequence): Колонки сортировки, например (Task.deadline, Task.id).
+        cursor (Optional[str]): Курсор предыдущей страницы.
+        limit (int): Размер страницы.
+        descending (bool): Сортировать по убыванию (по всем колонкам order_by).
+
+    Returns:
+        dict: Строки страницы (items) и курсор следующей страницы (next_cursor).
+    """
+    if cursor:
+        key, after = tuple_(*order_by), tuple_(*decode_cursor(cursor, order_by))
+        statement = statement.where(key < after if descending else key > after)
+    statement = statement.order_by(*(column.desc() if descending else column for column in order_by)).limit(limit + 1)
+    rows = (await session.exec(statement)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by])
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,161 @@
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PROFILING = os.getenv("PROFILING", "0") == "1"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_HEADER = "x-profile"
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+
+
+class Sampler:
+    """
+    Сэмплирующий профайлер: фоновый поток периодически снимает стеки всех потоков процесса.
+
+    Снимаются и поток цикла событий (асинхронные обработчики), и потоки пула
+    (ThreadedSession, run_in_threadpool, пул хеширования), поэтому ничего не нужно
+    инструментировать заранее. Простаивающие потоки (ожидание в threading/queue/selectors)
+    не учитываются. В профиль попадает и работа параллельных запросов того же процесса.
+
+    Attributes:
+        interval (float): Интервал между снимками в секундах.
+        samples (Counter): Число снимков каждого стека в формате collapsed stacks.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(re.sub(r"[-_ ]?\d+(_\d+)?$", "", names.get(ident, "thread")))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """
+        Вывести профиль в формате collapsed stacks (flamegraph.pl, speedscope, inferno).
+
+        Returns:
+            str: Строки «кадр;кадр;...;кадр число_снимков».
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def profile_path(method: str, path: str) -> str:
+    """
+    Сформировать имя файла профиля.
+
+    Args:
+        method (str): HTTP-метод.
+        path (str): Путь запроса.
+
+    Returns:
+        str: Путь к файлу в PROFILE_DIR.
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(PROFILE_DIR, f"{stamp}-{method}-{slug}.collapsed")
+
+
+def write_profile(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-middleware, профилирующий отдельный запрос по требованию.
+
+    Профилируется только запрос с заголовком X-Profile, равным PROFILING_TOKEN. Профиль
+    сохраняется в PROFILE_DIR в формате collapsed stacks, имя файла возвращается в заголовке
+    X-Profile-File. Одновременно снимается не больше одного профиля: пока он снимается,
+    остальные запросы с заголовком обрабатываются без профилирования.
+
+    Подключается в main.py только при PROFILING=1, поэтому в выключенном состоянии
+    не стоит ничего.
+
+    Args:
+        app: Следующее ASGI-приложение.
+        token (str): Значение заголовка X-Profile, включающее профилирование.
+    """
+
+    def __init__(self, app, token: str = PROFILING_TOKEN):
+        self.app = app
+        self.token = token.encode()
+        self.lock = threading.Lock()
+
+    def requested(self, scope) -> bool:
+        """Проверить, запрошено ли профилирование заголовком X-Profile."""
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                return bool(self.token) and hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self.lock.acquire(blocking=False):
+            logger.warning("Profile of %s %s skipped: another profile is running", scope["method"], scope["path"])
+            await self.app(scope, receive, send)
+            return
+        path = profile_path(scope["method"], scope["path"])
+        sampler = Sampler(PROFILE_INTERVAL_MS / 1000)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-file", path.encode())]
+            await send(message)
+
+        began = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            sampler.stop()
+            self.lock.release()
+            await run_in_threadpool(write_profile, path, sampler.collapsed())
+            logger.info("Profile of %s %s: %.1f ms, %d samples, saved to %s", scope["method"], scope["path"],
+                        (time.perf_counter() - began) * 1000, sum(sampler.samples.values()), path)
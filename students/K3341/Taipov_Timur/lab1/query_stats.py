@@ -0,0 +1,149 @@
+import logging
+import os
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+from connection import async_engine, engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS = os.getenv("QUERY_STATS", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_LIMIT = int(os.getenv("N_PLUS_ONE_LIMIT", "10"))
+N_PLUS_ONE_RAISE = os.getenv("N_PLUS_ONE_RAISE", "0") == "1"
+DEBUG = os.getenv("DEBUG", "0") == "1"
+PARAMETERS_LOG_LIMIT = 1000
+
+
+class NPlusOneError(RuntimeError):
+    """Один и тот же SELECT выполнен в запросе больше N_PLUS_ONE_LIMIT раз (при N_PLUS_ONE_RAISE=1)."""
+
+
+class QueryStats:
+    """
+    Статистика SQL-запросов одного HTTP-запроса.
+
+    Attributes:
+        method (str): HTTP-метод запроса.
+        path (str): Путь запроса.
+        count (int): Число выполненных SQL-запросов.
+        seconds (float): Суммарное время в базе данных.
+        shapes (dict): Число выполнений каждого SELECT (по тексту с плейсхолдерами).
+    """
+    __slots__ = ("method", "path", "count", "seconds", "shapes")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = defaultdict(int)
+
+    def record(self, statement: str, seconds: float) -> None:
+        """
+        Учесть выполненный запрос и проверить его на N+1.
+
+        Повторы считаются только для SELECT: пачки INSERT/UPDATE при массовой загрузке
+        законно выполняют один и тот же запрос много раз.
+
+        Args:
+            statement (str): Текст запроса с плейсхолдерами параметров.
+            seconds (float): Время выполнения.
+
+        Raises:
+            NPlusOneError: Если SELECT повторился больше N_PLUS_ONE_LIMIT раз и включён N_PLUS_ONE_RAISE.
+        """
+        self.count += 1
+        self.seconds += seconds
+        if statement.lstrip()[:6].upper() != "SELECT":
+            return
+        self.shapes[statement] += 1
+        if self.shapes[statement] == N_PLUS_ONE_LIMIT + 1:
+            message = (f"Possible N+1: {self.method} {self.path} executed the same statement more than "
+                       f"{N_PLUS_ONE_LIMIT} times: {statement}")
+            if N_PLUS_ONE_RAISE:
+                raise NPlusOneError(message)
+            logger.warning(message)
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_stats", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Обработчик события движка: записать время запроса, залогировать медленный запрос.
+
+    Контекст HTTP-запроса (current_stats) доступен и из пула потоков ThreadedSession,
+    и из greenlet асинхронного движка, так как оба копируют contextvars.
+    """
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning("Slow query %.1f ms: %s; parameters: %s", seconds * 1000, statement,
+                       repr(parameters)[:PARAMETERS_LOG_LIMIT])
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+
+def instrument(target) -> None:
+    """
+    Подписать движок на события выполнения запросов.
+
+    Args:
+        target (Engine): Синхронный движок (для асинхронного — его sync_engine).
+    """
+    event.listen(target, "before_cursor_execute", before_cursor_execute)
+    event.listen(target, "after_cursor_execute", after_cursor_execute)
+
+
+if QUERY_STATS:
+    instrument(engine)
+    if async_engine is not None:
+        instrument(async_engine.sync_engine)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-middleware, собирающий статистику SQL-запросов каждого HTTP-запроса.
+
+    При DEBUG=1 в ответ добавляются заголовки X-DB-Query-Count и X-DB-Time-Ms
+    (учитываются запросы, выполненные до начала отправки ответа).
+
+    Args:
+        app: Следующее ASGI-приложение.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope["method"], scope["path"])
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                ]
+            await send(message)
+
+        token = current_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers if DEBUG else send)
+        finally:
+            current_stats.reset(token)
@@ -0,0 +1,120 @@
+import os
+from calendar import monthrange
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import insert, update
+from sqlmodel import select
+
+from models import Routine, RoutineType, Task, TaskStatus
+
+load_dotenv()
+
+INSERT_CHUNK_SIZE = 1000
+MATERIALIZE_LIMIT = int(os.getenv("MATERIALIZE_LIMIT", "10000"))
+
+
+class TooManyOccurrences(ValueError):
+    """Число создаваемых за один вызов повторений превышает MATERIALIZE_LIMIT."""
+
+
+def occurrence_at(start: datetime, frequency: RoutineType, index: int) -> datetime:
+    """
+    Получить дату повторения рутины с номером index.
+
+    Месячные повторения сохраняют день месяца, а в коротких месяцах переносятся на последний день.
+
+    Args:
+        start (datetime): Срок исходной задачи рутины (повторение 0).
+        frequency (RoutineType): Частота.
+        index (int): Номер повторения.
+
+    Returns:
+        datetime: Срок повторения.
+    """
+    if frequency == RoutineType.daily:
+        return start + timedelta(days=index)
+    if frequency == RoutineType.weekly:
+        return start + timedelta(weeks=index)
+    months = start.month - 1 + index
+    year, month = start.year + months // 12, months % 12 + 1
+    return start.replace(year=year, month=month, day=min(start.day, monthrange(year, month)[1]))
+
+
+def iter_occurrences(start: datetime, frequency: RoutineType, count: int, first: int = 1,
+                     until: Optional[datetime] = None) -> Iterator[Tuple[int, datetime]]:
+    """
+    Лениво перечислить повторения рутины.
+
+    Args:
+        start (datetime): Срок исходной задачи рутины.
+        frequency (RoutineType): Частота.
+        count (int): Количество повторений.
+        first (int): Номер первого перечисляемого повторения.
+        until (Optional[datetime]): Перечислять только повторения раньше этой даты. Часовой пояс,
+            если указан, отбрасывается: сроки задач хранятся без пояса (как и в rollups.wall_clock).
+
+    Yields:
+        Tuple[int, datetime]: Номер повторения и его срок.
+    """
+    if until is not None:
+        until = until.replace(tzinfo=None)
+    for index in range(first, count + 1):
+        deadline = occurrence_at(start, frequency, index)
+        if until is not None and deadline >= until:
+            return
+        yield index, deadline
+
+
+async def materialize_occurrences(session, user_id: int, until: datetime,
+                                  limit: int = MATERIALIZE_LIMIT) -> List[int]:
+    """
+    Создать задачи для всех ещё не созданных повторений рутин пользователя до даты until.
+
+    Повторения начинаются после отметки уровня Routine.generated_count, поэтому
+    повторный вызов создаёт только новые даты. Все задачи вставляются
+    многострочными INSERT, отметки обновляются одним bulk UPDATE, а строки рутин
+    блокируются (FOR UPDATE на Postgres), чтобы параллельные вызовы не создали дубли.
+    Фиксация транзакции остаётся за вызывающим.
+
+    Args:
+        session (Session): Сессия базы данных.
+        user_id (int): Владелец рутин.
+        until (datetime): Конец окна (не включительно).
+        limit (int): Максимальное число задач, создаваемых за один вызов.
+
+    Returns:
+        List[int]: Идентификаторы созданных задач.
+
+    Raises:
+        TooManyOccurrences: Если до until больше limit несозданных повторений; ничего не создаётся.
+    """
+    statement = (
+        select(Routine.id, Routine.frequency, Routine.count, Routine.generated_count,
+               Task.name, Task.description, Task.difficulty, Task.priority, Task.deadline)
+        .join(Task, Task.id == Routine.task_id)
+        .where(Routine.user_id == user_id, Task.user_id == user_id, Routine.generated_count < Routine.count)
+        .with_for_update(of=Routine)
+    )
+    tasks = []
+    marks = []
+    for routine_id, frequency, count, generated, name, description, difficulty, priority, start in (
+        await session.execute(statement)
+    ):
+        last = None
+        for last, deadline in iter_occurrences(start, frequency, count, generated + 1, until):
+            if len(tasks) >= limit:
+                raise TooManyOccurrences(f"More than {limit} occurrences before {until.isoformat()}")
+            tasks.append({"name": name, "description": description, "status": TaskStatus.active,
+                          "difficulty": difficulty, "priority": priority, "deadline": deadline, "user_id": user_id})
+        if last is not None:
+            marks.append({"id": routine_id, "generated_count": last})
+    ids = []
+    for offset in range(0, len(tasks), INSERT_CHUNK_SIZE):
+        result = await session.execute(insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                                       tasks[offset:offset + INSERT_CHUNK_SIZE])
+        ids += result.scalars().all()
+    if marks:
+        await session.execute(update(Routine), marks)
+    return ids
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv()
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "response_cache.sqlite3")
+
+
+class MemoryResponseCache:
+    """
+    LRU-кэш готовых ответов в памяти процесса.
+
+    Запись хранится по ключу (пользователь, параметры запроса) вместе с ETag, под
+    которым она была построена. ETag включает версии коллекций пользователя
+    (см. versions.collection_etag), поэтому запись с другим ETag устарела: она
+    удаляется при первом обращении и не отдаётся. На один ключ приходится не больше
+    одной записи.
+
+    Attributes:
+        maxsize (int): Максимальное число записей.
+        hits (int): Число попаданий.
+        misses (int): Число промахов.
+        stale (int): Число записей, удалённых из-за изменения версии.
+        evictions (int): Число записей, вытесненных по LRU.
+    """
+
+    backend = "memory"
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[int, str], tuple[str, bytes]] = OrderedDict()
+
+    async def get(self, user_id: int, query: str, etag: str) -> Optional[bytes]:
+        """
+        Получить тело ответа из кэша.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            query (str): Строка параметров запроса.
+            etag (str): Текущий ETag списка.
+
+        Returns:
+            Optional[bytes]: Тело ответа или None, если записи нет или она устарела.
+        """
+        key = (user_id, query)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != etag:
+            if entry is not None:
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def put(self, user_id: int, query: str, etag: str, body: bytes) -> None:
+        """
+        Положить тело ответа в кэш.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            query (str): Строка параметров запроса.
+            etag (str): ETag, под которым построен ответ.
+            body (bytes): Сериализованное тело ответа.
+        """
+        if self.maxsize <= 0:
+            return
+        key = (user_id, query)
+        self._entries[key] = (etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Удалить все записи пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        """
+        Получить статистику кэша.
+
+        Returns:
+            dict: Бэкенд, размер, ёмкость, объём тел в байтах и счётчики обращений.
+        """
+        return {
+            "backend": self.backend,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "bytes": sum(len(body) for _, body in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
+
+
+class SqliteResponseCache(MemoryResponseCache):
+    """
+    Кэш готовых ответов в локальном файле SQLite.
+
+    Переживает перезапуск и общий для воркеров на одной машине. Логика устаревания
+    та же, что у MemoryResponseCache; порядок вытеснения задаёт время последнего
+    обращения. Запросы к файлу выполняются в пуле потоков.
+
+    Attributes:
+        path (str): Путь к файлу кэша.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, maxsize: int, path: str):
+        super().__init__(maxsize)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "user_id INTEGER NOT NULL, query TEXT NOT NULL, etag TEXT NOT NULL, "
+                "body BLOB NOT NULL, used REAL NOT NULL, PRIMARY KEY (user_id, query))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_used ON response_cache (used)")
+            self._connection = connection
+        return self._connection
+
+    def _get(self, user_id: int, query: str, etag: str) -> Optional[bytes]:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT etag, body FROM response_cache WHERE user_id = ? AND query = ?", (user_id, query)
+            ).fetchone()
+            if row is None or row[0] != etag:
+                if row is not None:
+                    connection.execute("DELETE FROM response_cache WHERE user_id = ? AND query = ?", (user_id, query))
+                    self.stale += 1
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE response_cache SET used = ? WHERE user_id = ? AND query = ?", (time.time(), user_id, query)
+            )
+            self.hits += 1
+            return row[1]
+
+    def _put(self, user_id: int, query: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO response_cache (user_id, query, etag, body, used) VALUES (?, ?, ?, ?, ?)",
+                (user_id, query, etag, body, time.time()),
+            )
+            excess = connection.execute("SELECT count(*) FROM response_cache").fetchone()[0] - self.maxsize
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM response_cache WHERE rowid IN "
+                    "(SELECT rowid FROM response_cache ORDER BY used LIMIT ?)", (excess,)
+                )
+                self.evictions += excess
+
+    def _invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM response_cache WHERE user_id = ?", (user_id,))
+
+    async def get(self, user_id: int, query: str, etag: str) -> Optional[bytes]:
+        return await run_in_threadpool(self._get, user_id, query, etag)
+
+    async def put(self, user_id: int, query: str, etag: str, body: bytes) -> None:
+        if self.maxsize > 0:
+            await run_in_threadpool(self._put, user_id, query, etag, body)
+
+    async def invalidate(self, user_id: int) -> None:
+        await run_in_threadpool(self._invalidate, user_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size, size_bytes = self._connect().execute(
+                "SELECT count(*), coalesce(sum(length(body)), 0) FROM response_cache"
+            ).fetchone()
+        return {
+            "backend": self.backend,
+            "path": self.path,
+            "size": size,
+            "maxsize": self.maxsize,
+            "bytes": size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
+
+
+def create_response_cache(backend: str) -> MemoryResponseCache:
+    """
+    Создать кэш ответов по названию бэкенда.
+
+    Args:
+        backend (str): "memory", "sqlite" или "none" (кэш выключен).
+
+    Returns:
+        MemoryResponseCache: Кэш ответов.
+
+    Raises:
+        ValueError: Если бэкенд неизвестен.
+    """
+    if backend == "memory":
+        return MemoryResponseCache(RESPONSE_CACHE_SIZE)
+    if backend == "sqlite":
+        return SqliteResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_PATH)
+    if backend == "none":
+        return MemoryResponseCache(0)
+    raise ValueError(f"Unknown response cache backend: {backend}")
+
+
+projects_cache = create_response_cache(RESPONSE_CACHE_BACKEND)
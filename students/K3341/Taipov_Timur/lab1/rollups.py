@@ -0,0 +1,206 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, cast, delete, func, insert, update
+from sqlmodel import select
+
+from connection import dialect_insert, dialect_name
+from models import Task, TimeLog, TimeLogDaily
+
+
+def wall_clock(value: datetime) -> datetime:
+    """
+    Отбросить у времени доли секунды и часовой пояс.
+
+    Колонки TimeLog хранят время без часового пояса: указанный во входных данных пояс
+    отбрасывается при записи, поэтому агрегаты считаются по тем же «настенным» часам,
+    что и timelog_seconds_sql и rebuild_timelog_daily.
+
+    Args:
+        value (datetime): Время, возможно с часовым поясом.
+
+    Returns:
+        datetime: Время без часового пояса и долей секунды.
+    """
+    return value.replace(microsecond=0, tzinfo=None)
+
+
+def timelog_seconds(start_time: datetime, end_time: datetime) -> int:
+    """
+    Посчитать длительность записи учёта времени в целых секундах.
+
+    Обе границы отбрасывают доли секунды и часовой пояс (wall_clock), как и timelog_seconds_sql,
+    чтобы инкрементальный пересчёт и полный пересчёт давали одинаковый результат.
+
+    Args:
+        start_time (datetime): Начало.
+        end_time (datetime): Конец.
+
+    Returns:
+        int: Длительность в секундах.
+    """
+    return int((wall_clock(end_time) - wall_clock(start_time)).total_seconds())
+
+
+def timelog_seconds_sql():
+    """
+    Получить SQL-выражение длительности записи учёта времени в целых секундах.
+
+    Returns:
+        SQL-выражение длительности TimeLog.
+    """
+    if dialect_name == "sqlite":
+        return cast(func.strftime("%s", TimeLog.end_time), Integer) - cast(func.strftime("%s", TimeLog.start_time), Integer)
+    return cast(
+        func.extract("epoch", func.date_trunc("second", TimeLog.end_time))
+        - func.extract("epoch", func.date_trunc("second", TimeLog.start_time)),
+        Integer,
+    )
+
+
+async def add_time_spent(session, task_id: int, seconds: int) -> None:
+    """
+    Изменить Task.time_spent на seconds одним UPDATE в текущей транзакции.
+
+    Args:
+        session (Session): Сессия базы данных.
+        task_id (int): Задача.
+        seconds (int): Прирост в секундах (отрицательный при удалении записи).
+    """
+    await session.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(time_spent=func.coalesce(Task.time_spent, 0) + seconds)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def recompute_time_spent(session, task_id: Optional[int] = None) -> int:
+    """
+    Пересчитать Task.time_spent по всем записям учёта времени.
+
+    Используется для исправления расхождений; обновляются только задачи,
+    у которых сохранённое значение отличается от суммы по TimeLog.
+
+    Args:
+        session (Session): Синхронная сессия базы данных.
+        task_id (Optional[int]): Пересчитать только эту задачу.
+
+    Returns:
+        int: Количество исправленных задач.
+    """
+    total = (
+        select(func.coalesce(func.sum(timelog_seconds_sql()), 0))
+        .where(TimeLog.task_id == Task.id)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Task)
+        .where(Task.time_spent.is_distinct_from(total))
+        .values(time_spent=total)
+        .execution_options(synchronize_session=False)
+    )
+    if task_id is not None:
+        statement = statement.where(Task.id == task_id)
+    result = session.execute(statement)
+    session.commit()
+    return result.rowcount
+
+
+def split_by_day(start_time: datetime, end_time: datetime) -> List[Tuple[date, int]]:
+    """
+    Разбить интервал по календарным дням.
+
+    Сумма секунд по дням совпадает с timelog_seconds для того же интервала.
+
+    Args:
+        start_time (datetime): Начало (часовой пояс, если указан, отбрасывается).
+        end_time (datetime): Конец.
+
+    Returns:
+        List[Tuple[date, int]]: День и количество секунд интервала в этом дне.
+    """
+    start_time = wall_clock(start_time)
+    end_time = wall_clock(end_time)
+    if end_time <= start_time:
+        return [(start_time.date(), timelog_seconds(start_time, end_time))]
+    parts = []
+    while start_time < end_time:
+        midnight = datetime.combine(start_time.date() + timedelta(days=1), datetime.min.time())
+        part_end = min(midnight, end_time)
+        parts.append((start_time.date(), int((part_end - start_time).total_seconds())))
+        start_time = part_end
+    return parts
+
+
+def upsert_daily(rows: List[dict]):
+    """
+    Построить INSERT ... ON CONFLICT, прибавляющий секунды к дневным итогам.
+
+    Args:
+        rows (List[dict]): Строки TimeLogDaily (user_id, task_id, day, seconds).
+
+    Returns:
+        Запрос для текущего диалекта базы данных.
+    """
+    statement = dialect_insert(TimeLogDaily).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "task_id", "day"],
+        set_={"seconds": TimeLogDaily.seconds + statement.excluded.seconds},
+    )
+
+
+async def apply_timelog(session, log: TimeLog, sign: int = 1) -> None:
+    """
+    Учесть запись учёта времени во всех агрегатах в текущей транзакции.
+
+    Обновляются Task.time_spent и дневные итоги TimeLogDaily. При удалении записи
+    дневные итоги, опустившиеся до нуля, удаляются.
+
+    Args:
+        session (Session): Сессия базы данных.
+        log (TimeLog): Созданная или удаляемая запись.
+        sign (int): 1 при создании записи, -1 при удалении.
+    """
+    await add_time_spent(session, log.task_id, sign * timelog_seconds(log.start_time, log.end_time))
+    parts = split_by_day(log.start_time, log.end_time)
+    rows = [
+        {"user_id": log.user_id, "task_id": log.task_id, "day": day, "seconds": sign * seconds}
+        for day, seconds in parts
+    ]
+    await session.execute(upsert_daily(rows))
+    if sign < 0:
+        await session.execute(
+            delete(TimeLogDaily)
+            .where(TimeLogDaily.user_id == log.user_id, TimeLogDaily.task_id == log.task_id,
+                   TimeLogDaily.day.in_([day for day, _ in parts]), TimeLogDaily.seconds <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_timelog_daily(session, batch_size: int = 10000) -> int:
+    """
+    Полностью пересобрать таблицу дневных итогов по записям учёта времени.
+
+    Args:
+        session (Session): Синхронная сессия базы данных.
+        batch_size (int): Размер пачки при чтении TimeLog.
+
+    Returns:
+        int: Количество строк в пересобранной таблице.
+    """
+    totals = defaultdict(int)
+    statement = select(TimeLog.user_id, TimeLog.task_id, TimeLog.start_time, TimeLog.end_time)
+    for user_id, task_id, start_time, end_time in session.exec(statement.execution_options(yield_per=batch_size)):
+        for day, seconds in split_by_day(start_time, end_time):
+            totals[(user_id, task_id, day)] += seconds
+    rows = [
+        {"user_id": user_id, "task_id": task_id, "day": day, "seconds": seconds}
+        for (user_id, task_id, day), seconds in totals.items()
+    ]
+    session.execute(delete(TimeLogDaily))
+    for offset in range(0, len(rows), batch_size):
+        session.execute(insert(TimeLogDaily), rows[offset:offset + batch_size])
+    session.commit()
+    return len(rows)
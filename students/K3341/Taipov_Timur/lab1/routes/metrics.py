@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+
+from metrics import CONTENT_TYPE, request_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """
+    Получить метрики запросов и пула соединений в текстовом формате Prometheus.
+
+    Эндпоинт не требует авторизации, чтобы его мог опрашивать Prometheus; закрывать
+    его от внешнего доступа следует на уровне прокси.
+
+    Returns:
+        Response: Метрики в формате text/plain; version=0.0.4.
+    """
+    return Response(content=request_metrics.render(), media_type=CONTENT_TYPE)
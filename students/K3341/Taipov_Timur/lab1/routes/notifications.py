@@ -1,19 +1,25 @@
-from fastapi import Depends, HTTPException, APIRouter
+from fastapi import Depends, HTTPException, APIRouter, Query, Response
 
 from auth import get_current_user
 from models import *
 from sqlmodel import select
 
 from connection import get_session
+from scheduler import notification_scheduler
+from serialization import paginate_read
+from pagination import DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.post("/", response_model=NotificationRead)
-def create_notification(data: NotificationCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_notification(data: NotificationCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новое уведомление для текущего пользователя.
 
+    Если напоминание попадает в загруженное окно планировщика, оно сразу добавляется в его кучу.
+
     Args:
         data (NotificationCreate): Данные нового уведомления.
         session (Session): Сессия базы данных.
@@ -22,32 +28,39 @@ def create_notification(data: NotificationCreate, session=Depends(get_session),
     Returns:
         NotificationRead: Данные созданного уведомления.
     """
-    db_notification = Notification(**data.dict(), user_id=user.id)
+    db_notification = Notification(**data.dict(exclude={"user_id"}), user_id=user.id)
     session.add(db_notification)
-    session.commit()
-    session.refresh(db_notification)
+    await bump_versions(session, [user.id], "notifications")
+    await session.commit()
+    await session.refresh(db_notification)
+    notification_scheduler.schedule(db_notification.id, db_notification.remind_at)
     return db_notification
 
 
-@router.get("/", response_model=List[NotificationRead])
-def read_notifications(session=Depends(get_session), user: User = Depends(get_current_user)):
+@router.get("/", response_model=NotificationPage, dependencies=[Depends(collection_etag("notifications"))])
+async def read_notifications(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                             fields: Optional[str] = None, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    Получить список всех уведомлений текущего пользователя.
+    Получить страницу уведомлений текущего пользователя, отсортированных по времени напоминания.
 
     Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
 
     Returns:
-        List[NotificationRead]: Список уведомлений.
+        NotificationPage: Страница уведомлений и курсор следующей страницы.
     """
-    return session.exec(select(Notification).where(Notification.user_id == user.id)).all()
+    return await paginate_read(session, select(Notification).where(Notification.user_id == user.id), NotificationRead, (Notification.remind_at, Notification.id), cursor, limit, response, fields)
 
 
 @router.delete("/{notification_id}")
-def delete_notification(notification_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_notification(notification_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    Удалить уведомление по идентификатору.
+    Удалить уведомление по идентификатору и отменить его напоминание.
 
     Args:
         notification_id (int): Идентификатор уведомления.
@@ -60,10 +73,12 @@ def delete_notification(notification_id: int, session=Depends(get_session), user
     Raises:
         HTTPException: Если уведомление не найдено или пользователь не авторизован для его удаления.
     """
-    notification = session.get(Notification, notification_id)
+    notification = await session.get(Notification, notification_id)
     if not notification or notification.user_id != user.id:
         raise HTTPException(status_code=404, detail="Notification not found or unauthorized")
-    session.delete(notification)
-    session.commit()
+    await session.delete(notification)
+    await bump_versions(session, [user.id], "notifications")
+    await session.commit()
+    notification_scheduler.cancel(notification_id)
     return {"ok": True}
 
@@ -1,4 +1,7 @@
-from fastapi import Depends, HTTPException, APIRouter
+import orjson
+from fastapi import Depends, HTTPException, APIRouter, Query, Request, Response
+from sqlalchemy import case, func
+import sqlalchemy
 
 from auth import get_current_user
 from models import *
@@ -6,12 +9,17 @@ from sqlmodel import select
 from sqlalchemy.orm import selectinload
 
 from connection import get_session
+import serialization
+from response_cache import projects_cache
+from pagination import paginate, DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
+from routes.tasks import SORT_KEYS, task_filters
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
 @router.post("/", response_model=ProjectRead)
-def create_project(project: ProjectCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_project(project: ProjectCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новый проект для текущего пользователя.
 
@@ -23,38 +31,193 @@ def create_project(project: ProjectCreate, session=Depends(get_session), user: U
     Returns:
         ProjectRead: Данные созданного проекта.
     """
-    db_project = Project(**project.dict(), user_id=user.id)
+    db_project = Project(**project.dict(exclude={"user_id"}), user_id=user.id)
     session.add(db_project)
-    session.commit()
-    session.refresh(db_project)
+    await bump_versions(session, [user.id], "projects")
+    await session.commit()
+    await session.refresh(db_project, ["tasks"])
     return db_project
 
 
-@router.get("/", response_model=List[ProjectRead])
-def read_projects(session=Depends(get_session), user: User = Depends(get_current_user)):
+async def read_project_rows(session, user_id: int, cursor: Optional[str], limit: int,
+                            fields: Optional[list[str]] = None) -> dict:
     """
-    Получить список всех проектов текущего пользователя.
+    Получить страницу проектов с задачами без ORM-объектов (быстрый путь и fields).
+
+    Выбираются только нужные колонки ProjectRead и TaskRead: страница проектов одним
+    запросом и задачи всех проектов страницы вторым, через ProjectTaskLink. Если в fields
+    нет tasks, второй запрос не выполняется.
 
     Args:
+        session (Session): Сессия базы данных.
+        user_id (int): Идентификатор пользователя.
+        cursor (Optional[str]): Курсор следующей страницы.
+        limit (int): Размер страницы.
+        fields (Optional[list[str]]): Поля проектов (из parse_fields) или None для всех.
+
+    Returns:
+        dict: Страница в формате ProjectPage из словарей.
+    """
+    columns, keys = serialization.projection(serialization.read_columns(Project, ProjectRead, fields), (Project.id,))
+    page = await paginate(session, select(*columns).where(Project.user_id == user_id), (Project.id,), cursor, limit)
+    items = [dict(zip(keys, row)) for row in page["items"]]
+    if items and (fields is None or "tasks" in fields):
+        tasks = {}
+        for item, row in zip(items, page["items"]):
+            item["tasks"] = tasks[row.id] = []
+        statement = (
+            select(ProjectTaskLink.project_id, *serialization.read_columns(Task, TaskRead))
+            .join(Task, Task.id == ProjectTaskLink.task_id)
+            .where(ProjectTaskLink.project_id.in_(tasks))
+            .order_by(Task.id)
+        )
+        for row in (await session.execute(statement)).all():
+            task = row._asdict()
+            tasks[task.pop("project_id")].append(task)
+    return {"items": items, "next_cursor": page["next_cursor"]}
+
+
+@router.get("/", response_model=ProjectPage)
+async def read_projects(request: Request, cursor: Optional[str] = None,
+                        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT), fields: Optional[str] = None,
+                        session=Depends(get_session),
+                        user: User = Depends(get_current_user), etag: str = Depends(collection_etag("projects", "tasks"))):
+    """
+    Получить страницу проектов текущего пользователя.
+
+    Каждый проект возвращается со всеми задачами; для списка без задач есть
+    /projects/summary, для задач одного проекта — /projects/{project_id}/tasks.
+    Готовый JSON страницы кэшируется (projects_cache) под ETag, который меняется при любом
+    изменении проектов, задач или их связей у пользователя, поэтому устаревшая страница не отдаётся.
+
+    Args:
+        request (Request): Запрос (параметры входят в ключ кэша).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля проектов через запятую (например, "id,name"); без tasks задачи не загружаются.
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
+        etag (str): ETag списка из версий проектов и задач пользователя.
 
     Returns:
-        List[ProjectRead]: Список проектов.
+        ProjectPage: Страница проектов и курсор следующей страницы.
     """
+    selected = serialization.parse_fields(fields, ProjectRead)
+    query = str(request.query_params)
+    body = await projects_cache.get(user.id, query, etag)
+    if body is None:
+        if selected is not None or serialization.FAST_JSON:
+            body = orjson.dumps(await read_project_rows(session, user.id, cursor, limit, selected))
+        else:
+            statement = (
+                select(Project)
+                .where(Project.user_id == user.id)
+                .options(selectinload(Project.tasks))
+            )
+            page = await paginate(session, statement, (Project.id,), cursor, limit)
+            body = ProjectPage.model_validate(page, from_attributes=True).model_dump_json().encode()
+        await projects_cache.put(user.id, query, etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/summary", response_model=ProjectSummaryPage, dependencies=[Depends(collection_etag("projects", "tasks"))])
+async def read_projects_summary(cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                                session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Получить страницу проектов текущего пользователя со сводкой по задачам.
+
+    Сводка считается одним запросом с группировкой по проекту (LEFT JOIN через
+    ProjectTaskLink), сами задачи не загружаются, поэтому размер ответа не зависит
+    от числа задач в проектах.
+
+    Args:
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        ProjectSummaryPage: Страница сводок и курсор следующей страницы.
+    """
+    def count_status(status: TaskStatus):
+        return func.count(case((Task.status == status, Task.id)))
+
     statement = (
-        select(Project)
+        sqlalchemy.select(
+            Project.id, Project.name, Project.description, Project.user_id,
+            func.count(Task.id).label("task_count"),
+            count_status(TaskStatus.active).label("active_count"),
+            count_status(TaskStatus.completed).label("completed_count"),
+            count_status(TaskStatus.archived).label("archived_count"),
+            func.min(case((Task.status == TaskStatus.active, Task.deadline))).label("nearest_deadline"),
+            func.coalesce(func.sum(Task.time_spent), 0).label("time_spent"),
+        )
+        .outerjoin(ProjectTaskLink, ProjectTaskLink.project_id == Project.id)
+        .outerjoin(Task, Task.id == ProjectTaskLink.task_id)
         .where(Project.user_id == user.id)
-        .options(selectinload(Project.tasks))
+        .group_by(Project.id)
     )
-    return session.exec(statement).all()
+    return await paginate(session, statement, (Project.id,), cursor, limit)
+
+
+@router.get("/cache")
+async def projects_cache_stats(user: User = Depends(get_current_user)):
+    """
+    Получить статистику кэша страниц проектов.
+
+    Args:
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        dict: Бэкенд, размер кэша, объём в байтах, число попаданий, промахов и вытеснений.
+    """
+    return projects_cache.stats()
+
+
+@router.get("/{project_id}/tasks", response_model=TaskPage,
+            dependencies=[Depends(collection_etag("projects", "tasks"))])
+async def read_project_tasks(project_id: int, response: Response, cursor: Optional[str] = None,
+                             limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT), fields: Optional[str] = None,
+                             sort: str = Query("deadline", pattern=f"^-?({'|'.join(SORT_KEYS)})$"),
+                             filters: list = Depends(task_filters), session=Depends(get_session),
+                             user: User = Depends(get_current_user)):
+    """
+    Получить страницу задач проекта с теми же фильтрами и сортировками, что у /tasks.
+
+    Args:
+        project_id (int): Идентификатор проекта.
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа (для того же sort).
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую.
+        sort (str): Ключ сортировки (deadline или priority), с префиксом "-" — по убыванию.
+        filters (list): Условия из task_filters.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        TaskPage: Страница задач и курсор следующей страницы.
+
+    Raises:
+        HTTPException: Если проект не найден или пользователь не авторизован.
+    """
+    project = await session.get(Project, project_id)
+    if not project or project.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Project not found or unauthorized")
+    linked = select(ProjectTaskLink.task_id).where(ProjectTaskLink.project_id == project_id)
+    statement = select(Task).where(Task.id.in_(linked), *filters)
+    order_by = (SORT_KEYS[sort.lstrip("-")], Task.id)
+    return await serialization.paginate_read(session, statement, TaskRead, order_by, cursor, limit, response, fields,
+                                             descending=sort.startswith("-"))
 
 
 @router.delete("/{project_id}")
-def delete_project(project_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_project(project_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить проект по идентификатору.
 
+    Вместе с проектом удаляются его связи с задачами, поэтому увеличивается и версия списка задач.
+
     Args:
         project_id (int): Идентификатор проекта.
         session (Session): Сессия базы данных.
@@ -66,16 +229,17 @@ def delete_project(project_id: int, session=Depends(get_session), user: User = D
     Raises:
         HTTPException: Если проект не найден или пользователь не авторизован.
     """
-    project = session.get(Project, project_id)
+    project = await session.get(Project, project_id)
     if not project or project.user_id != user.id:
         raise HTTPException(status_code=404, detail="Project not found or unauthorized")
-    session.delete(project)
-    session.commit()
+    await session.delete(project)
+    await bump_versions(session, [user.id], "projects", "tasks")
+    await session.commit()
     return {"ok": True}
 
 
 @router.patch("/{project_id}", response_model=ProjectRead)
-def update_project(project_id: int, project_data: ProjectCreate, session=Depends(get_session),
+async def update_project(project_id: int, project_data: ProjectCreate, session=Depends(get_session),
                    user: User = Depends(get_current_user)):
     """
     Обновить данные проекта по идентификатору.
@@ -92,13 +256,14 @@ def update_project(project_id: int, project_data: ProjectCreate, session=Depends
     Raises:
         HTTPException: Если проект не найден или пользователь не авторизован.
     """
-    project = session.get(Project, project_id)
+    project = await session.get(Project, project_id)
     if not project or project.user_id != user.id:
         raise HTTPException(status_code=404, detail="Project not found or unauthorized")
     for key, value in project_data.dict(exclude_unset=True).items():
         setattr(project, key, value)
     session.add(project)
-    session.commit()
-    session.refresh(project)
+    await bump_versions(session, [user.id], "projects")
+    await session.commit()
+    await session.refresh(project, ["tasks"])
     return project
 
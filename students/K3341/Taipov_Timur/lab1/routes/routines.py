@@ -1,16 +1,22 @@
-from fastapi import Depends, HTTPException, APIRouter
+from itertools import islice
+
+from fastapi import Depends, HTTPException, APIRouter, Query, Response
 
 from auth import get_current_user
 from models import *
 from sqlmodel import select
 
 from connection import get_session
+from serialization import paginate_read
+from pagination import DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
+from recurrence import TooManyOccurrences, iter_occurrences, materialize_occurrences
 
 router = APIRouter(prefix="/routines", tags=["Routines"])
 
 
 @router.post("/", response_model=RoutineRead)
-def create_routine(routine: RoutineCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_routine(routine: RoutineCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новую рутину (повторяющееся действие) для текущего пользователя.
 
@@ -21,31 +27,104 @@ def create_routine(routine: RoutineCreate, session=Depends(get_session), user: U
 
     Returns:
         RoutineRead: Данные созданной рутины.
+
+    Raises:
+        HTTPException: Если задача рутины не найдена или пользователь не авторизован для неё.
     """
-    db_routine = Routine(**routine.dict(), user_id=user.id)
+    task = await session.get(Task, routine.task_id)
+    if not task or task.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Task not found or unauthorized")
+    db_routine = Routine(**routine.dict(exclude={"user_id"}), user_id=user.id)
     session.add(db_routine)
-    session.commit()
-    session.refresh(db_routine)
+    await bump_versions(session, [user.id], "routines")
+    await session.commit()
+    await session.refresh(db_routine)
     return db_routine
 
 
-@router.get("/", response_model=List[RoutineRead])
-def read_routines(session=Depends(get_session), user: User = Depends(get_current_user)):
+@router.get("/", response_model=RoutinePage, dependencies=[Depends(collection_etag("routines"))])
+async def read_routines(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                        fields: Optional[str] = None, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    Получить список всех рутин текущего пользователя.
+    Получить страницу рутин текущего пользователя.
 
     Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
 
     Returns:
-        List[RoutineRead]: Список рутин.
+        RoutinePage: Страница рутин и курсор следующей страницы.
+    """
+    return await paginate_read(session, select(Routine).where(Routine.user_id == user.id), RoutineRead, (Routine.id,), cursor, limit, response, fields)
+
+
+@router.post("/materialize")
+async def materialize_routines(until: datetime, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    return session.exec(select(Routine).where(Routine.user_id == user.id)).all()
+    Создать задачи для повторений всех рутин текущего пользователя до даты until.
+
+    Создаются только повторения, которые ещё не были созданы ранее, всё в одной транзакции,
+    и не больше MATERIALIZE_LIMIT задач за вызов.
+
+    Args:
+        until (datetime): Конец окна (не включительно).
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        dict: Количество созданных задач.
+
+    Raises:
+        HTTPException: Если до until больше MATERIALIZE_LIMIT несозданных повторений (422);
+            в этом случае нужно выбрать более раннюю дату.
+    """
+    try:
+        ids = await materialize_occurrences(session, user.id, until)
+    except TooManyOccurrences as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    await bump_versions(session, [user.id], "routines", "tasks")
+    await session.commit()
+    return {"created": len(ids)}
+
+
+@router.get("/{routine_id}/occurrences", response_model=List[RoutineOccurrence])
+async def read_occurrences(routine_id: int, until: datetime, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                           session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Получить повторения рутины до даты until без создания задач.
+
+    Args:
+        routine_id (int): Идентификатор рутины.
+        until (datetime): Конец окна (не включительно).
+        limit (int): Максимальное количество повторений в ответе.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        List[RoutineOccurrence]: Повторения с отметкой, созданы ли для них задачи.
+
+    Raises:
+        HTTPException: Если рутина или её задача не найдена или пользователь не авторизован.
+    """
+    routine = await session.get(Routine, routine_id)
+    if not routine or routine.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Routine not found or unauthorized")
+    task = await session.get(Task, routine.task_id)
+    if not task or task.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Task not found or unauthorized")
+    occurrences = iter_occurrences(task.deadline, routine.frequency, routine.count, until=until)
+    return [
+        {"index": index, "deadline": deadline, "materialized": index <= routine.generated_count}
+        for index, deadline in islice(occurrences, limit)
+    ]
 
 
 @router.delete("/{routine_id}")
-def delete_routine(routine_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_routine(routine_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить рутину по идентификатору.
 
@@ -60,10 +139,11 @@ def delete_routine(routine_id: int, session=Depends(get_session), user: User = D
     Raises:
         HTTPException: Если рутина не найдена или пользователь не авторизован для её удаления.
     """
-    routine = session.get(Routine, routine_id)
+    routine = await session.get(Routine, routine_id)
     if not routine or routine.user_id != user.id:
         raise HTTPException(status_code=404, detail="Routine not found or unauthorized")
-    session.delete(routine)
-    session.commit()
+    await session.delete(routine)
+    await bump_versions(session, [user.id], "routines")
+    await session.commit()
     return {"ok": True}
 
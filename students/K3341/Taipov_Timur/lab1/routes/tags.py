@@ -1,16 +1,19 @@
-from fastapi import Depends, HTTPException, APIRouter
+from fastapi import Depends, HTTPException, APIRouter, Query, Response
 
 from auth import get_current_user
 from models import *
 from sqlmodel import select
 
 from connection import get_session
+from serialization import paginate_read
+from pagination import DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
 
 router = APIRouter(prefix="/tags", tags=["Tags"])
 
 
 @router.post("/", response_model=TagRead)
-def create_tag(tag: TagCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_tag(tag: TagCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новый тег для текущего пользователя.
 
@@ -22,33 +25,41 @@ def create_tag(tag: TagCreate, session=Depends(get_session), user: User = Depend
     Returns:
         TagRead: Данные созданного тега.
     """
-    db_tag = Tag(**tag.dict(), user_id=user.id)
+    db_tag = Tag(**tag.dict(exclude={"user_id"}), user_id=user.id)
     session.add(db_tag)
-    session.commit()
-    session.refresh(db_tag)
+    await bump_versions(session, [user.id], "tags")
+    await session.commit()
+    await session.refresh(db_tag)
     return db_tag
 
 
-@router.get("/", response_model=List[TagRead])
-def read_tags(session=Depends(get_session), user: User = Depends(get_current_user)):
+@router.get("/", response_model=TagPage, dependencies=[Depends(collection_etag("tags"))])
+async def read_tags(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                    fields: Optional[str] = None, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    Получить список всех тегов текущего пользователя.
+    Получить страницу тегов текущего пользователя.
 
     Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
 
     Returns:
-        List[TagRead]: Список тегов.
+        TagPage: Страница тегов и курсор следующей страницы.
     """
-    return session.exec(select(Tag).where(Tag.user_id == user.id)).all()
+    return await paginate_read(session, select(Tag).where(Tag.user_id == user.id), TagRead, (Tag.id,), cursor, limit, response, fields)
 
 
 @router.delete("/{tag_id}")
-def delete_tag(tag_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_tag(tag_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить тег по идентификатору.
 
+    Вместе с тегом удаляются его связи с задачами, поэтому увеличивается и версия списка задач.
+
     Args:
         tag_id (int): Идентификатор тега.
         session (Session): Сессия базы данных.
@@ -60,10 +71,11 @@ def delete_tag(tag_id: int, session=Depends(get_session), user: User = Depends(g
     Raises:
         HTTPException: Если тег не найден или пользователь не авторизован для его удаления.
     """
-    tag = session.get(Tag, tag_id)
+    tag = await session.get(Tag, tag_id)
     if not tag or tag.user_id != user.id:
         raise HTTPException(status_code=404, detail="Tag not found or unauthorized")
-    session.delete(tag)
-    session.commit()
+    await session.delete(tag)
+    await bump_versions(session, [user.id], "tags", "tasks")
+    await session.commit()
     return {"ok": True}
 
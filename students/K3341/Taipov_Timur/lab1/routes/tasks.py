@@ -1,17 +1,52 @@
-from fastapi import Depends, HTTPException, APIRouter
+from typing import AsyncIterator
+
+from fastapi import Depends, HTTPException, APIRouter, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from auth import get_current_user
 from models import *
 from sqlmodel import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import delete, exists, func, insert
 
 from connection import get_session
+from serialization import paginate_read
+from pagination import paginate, DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
+from search import search_statement
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+BULK_CHUNK_SIZE = 1000
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+task_list_adapter = TypeAdapter(List[TaskCreate])
+SORT_KEYS = {"deadline": Task.deadline, "priority": Task.priority}
+
+
+async def check_projects(session, project_ids: List[int], user_id: int) -> None:
+    """
+    Проверить, что проекты, к которым привязываются задачи, принадлежат пользователю.
+
+    Args:
+        session (Session): Сессия базы данных.
+        project_ids (List[int]): Идентификаторы проектов.
+        user_id (int): Владелец задач.
+
+    Raises:
+        HTTPException: Если какой-либо проект не найден или принадлежит другому пользователю.
+    """
+    ids = set(project_ids)
+    if not ids:
+        return
+    owned = await session.scalar(
+        select(func.count()).select_from(Project).where(Project.id.in_(ids), Project.user_id == user_id)
+    )
+    if owned != len(ids):
+        raise HTTPException(status_code=404, detail="Project not found or unauthorized")
+
 
 @router.post("", response_model=TaskRead)
-def create_task(task_data: TaskCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_task(task_data: TaskCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новую задачу для текущего пользователя.
 
@@ -22,42 +57,300 @@ def create_task(task_data: TaskCreate, session=Depends(get_session), user: User
 
     Returns:
         TaskRead: Данные созданной задачи.
+
+    Raises:
+        HTTPException: Если проект из project_ids не найден или пользователь не авторизован для него.
     """
+    await check_projects(session, task_data.project_ids or [], user.id)
     task = Task(**task_data.dict(exclude={"project_ids"}), user_id=user.id)
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.flush()
 
     if task_data.project_ids:
         for pid in task_data.project_ids:
             link = ProjectTaskLink(task_id=task.id, project_id=pid)
             session.add(link)
-        session.commit()
+    await bump_versions(session, [user.id], "tasks")
+    await session.commit()
+    await session.refresh(task)
 
     return task
 
 
-@router.get("", response_model=List[TaskRead])
-def read_tasks(session=Depends(get_session), user: User = Depends(get_current_user)):
+def parse_ndjson_task(line: bytes, line_number: int) -> TaskCreate:
     """
-    Получить список всех задач текущего пользователя.
+    Разобрать одну строку NDJSON в задачу.
 
     Args:
+        line (bytes): Строка с JSON-объектом задачи.
+        line_number (int): Номер строки (для сообщения об ошибке).
+
+    Returns:
+        TaskCreate: Данные задачи.
+
+    Raises:
+        RequestValidationError: Если строка не прошла валидацию.
+    """
+    try:
+        return TaskCreate.model_validate_json(line)
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", line_number, *error["loc"])}
+                                      for error in e.errors(include_url=False)])
+
+
+async def read_bulk_tasks(request: Request) -> AsyncIterator[TaskCreate]:
+    """
+    Прочитать задачи из тела запроса на массовое создание.
+
+    NDJSON читается построчно по мере поступления тела, без загрузки всего запроса в память.
+    Любой другой тип содержимого разбирается как JSON-массив.
+
+    Args:
+        request (Request): Входящий запрос.
+
+    Yields:
+        TaskCreate: Данные очередной задачи.
+
+    Raises:
+        RequestValidationError: Если задача не прошла валидацию.
+    """
+    if not request.headers.get("content-type", "").startswith(NDJSON_TYPES):
+        try:
+            tasks = task_list_adapter.validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        for task_data in tasks:
+            yield task_data
+        return
+
+    line_number = 0
+    tail = b""
+    async for chunk in request.stream():
+        *lines, tail = (tail + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield parse_ndjson_task(line, line_number)
+    if tail.strip():
+        yield parse_ndjson_task(tail, line_number + 1)
+
+
+async def insert_tasks(session, batch: List[TaskCreate], user_id: int) -> List[int]:
+    """
+    Вставить пачку задач и их связи с проектами многострочными INSERT.
+
+    Args:
+        session (Session): Сессия базы данных.
+        batch (List[TaskCreate]): Данные задач.
+        user_id (int): Владелец задач.
+
+    Returns:
+        List[int]: Идентификаторы созданных задач в порядке batch.
+
+    Raises:
+        HTTPException: Если проект из project_ids не найден или пользователь не авторизован для него.
+    """
+    await check_projects(session, [pid for task_data in batch for pid in task_data.project_ids or []], user_id)
+    rows = [{**task_data.model_dump(exclude={"project_ids"}), "user_id": user_id} for task_data in batch]
+    result = await session.execute(insert(Task).returning(Task.id, sort_by_parameter_order=True), rows)
+    ids = result.scalars().all()
+    links = [
+        {"task_id": task_id, "project_id": pid}
+        for task_id, task_data in zip(ids, batch)
+        for pid in task_data.project_ids or []
+    ]
+    if links:
+        await session.execute(insert(ProjectTaskLink), links)
+    return ids
+
+
+@router.post("/bulk")
+async def create_tasks_bulk(request: Request, session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Массово создать задачи для текущего пользователя в одной транзакции.
+
+    Тело запроса: JSON-массив TaskCreate или NDJSON (Content-Type: application/x-ndjson),
+    по одной задаче на строку. Задачи и связи с проектами вставляются пачками по BULK_CHUNK_SIZE.
+
+    Args:
+        request (Request): Входящий запрос с задачами.
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
 
     Returns:
-        List[TaskRead]: Список задач.
+        dict: Идентификаторы созданных задач в порядке следования в запросе.
+
+    Raises:
+        HTTPException: Если проект из project_ids не найден или пользователь не авторизован для него;
+            в этом случае ни одна задача не создаётся.
     """
-    tasks = session.exec(select(Task).where(Task.user_id == user.id)).all()
-    return tasks
+    ids = []
+    batch = []
+    async for task_data in read_bulk_tasks(request):
+        batch.append(task_data)
+        if len(batch) >= BULK_CHUNK_SIZE:
+            ids += await insert_tasks(session, batch, user.id)
+            batch = []
+    if batch:
+        ids += await insert_tasks(session, batch, user.id)
+    await bump_versions(session, [user.id], "tasks")
+    await session.commit()
+    return {"ids": ids}
+
+
+def task_filters(status: Optional[List[TaskStatus]] = Query(None),
+                 priority_min: Optional[int] = None, priority_max: Optional[int] = None,
+                 difficulty_min: Optional[int] = None, difficulty_max: Optional[int] = None,
+                 deadline_after: Optional[datetime] = None, deadline_before: Optional[datetime] = None,
+                 project_id: Optional[int] = None, tag_id: Optional[int] = None,
+                 tags_all: Optional[List[int]] = Query(None), tags_any: Optional[List[int]] = Query(None),
+                 tags_none: Optional[List[int]] = Query(None)) -> list:
+    """
+    Собрать условия фильтрации задач из параметров запроса.
+
+    Статус и срок используют индекс ix_task_user_id_status_deadline_id, приоритет —
+    ix_task_user_id_priority_id, проект и тег — индексы таблиц связей. Условия по
+    тегам становятся подзапросами к TagTaskLink внутри того же запроса: tags_all —
+    группировка по задаче с проверкой числа тегов, tags_any — полусоединение,
+    tags_none — NOT EXISTS по индексу ix_tagtasklink_tag_id_task_id.
+
+    Args:
+        status (Optional[List[TaskStatus]]): Допустимые статусы (параметр можно повторять).
+        priority_min (Optional[int]): Минимальный приоритет включительно.
+        priority_max (Optional[int]): Максимальный приоритет включительно.
+        difficulty_min (Optional[int]): Минимальная сложность включительно.
+        difficulty_max (Optional[int]): Максимальная сложность включительно.
+        deadline_after (Optional[datetime]): Срок не раньше этого момента.
+        deadline_before (Optional[datetime]): Срок раньше этого момента.
+        project_id (Optional[int]): Только задачи проекта.
+        tag_id (Optional[int]): Только задачи с тегом.
+        tags_all (Optional[List[int]]): Задача должна иметь все эти теги (параметр можно повторять).
+        tags_any (Optional[List[int]]): Задача должна иметь хотя бы один из этих тегов.
+        tags_none (Optional[List[int]]): Задача не должна иметь ни одного из этих тегов.
+
+    Returns:
+        list: Условия для where.
+    """
+    conditions = []
+    if status:
+        conditions.append(Task.status.in_(status))
+    if priority_min is not None:
+        conditions.append(Task.priority >= priority_min)
+    if priority_max is not None:
+        conditions.append(Task.priority <= priority_max)
+    if difficulty_min is not None:
+        conditions.append(Task.difficulty >= difficulty_min)
+    if difficulty_max is not None:
+        conditions.append(Task.difficulty <= difficulty_max)
+    if deadline_after is not None:
+        conditions.append(Task.deadline >= deadline_after)
+    if deadline_before is not None:
+        conditions.append(Task.deadline < deadline_before)
+    if project_id is not None:
+        conditions.append(Task.id.in_(select(ProjectTaskLink.task_id).where(ProjectTaskLink.project_id == project_id)))
+    if tag_id is not None:
+        conditions.append(Task.id.in_(select(TagTaskLink.task_id).where(TagTaskLink.tag_id == tag_id)))
+    if tags_all:
+        tags_all = set(tags_all)
+        conditions.append(Task.id.in_(
+            select(TagTaskLink.task_id)
+            .where(TagTaskLink.tag_id.in_(tags_all))
+            .group_by(TagTaskLink.task_id)
+            .having(func.count() == len(tags_all))
+        ))
+    if tags_any:
+        conditions.append(Task.id.in_(select(TagTaskLink.task_id).where(TagTaskLink.tag_id.in_(set(tags_any)))))
+    if tags_none:
+        conditions.append(~exists().where(TagTaskLink.task_id == Task.id, TagTaskLink.tag_id.in_(set(tags_none))))
+    return conditions
+
+
+@router.get("", response_model=TaskPage, dependencies=[Depends(collection_etag("tasks"))])
+async def read_tasks(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                     fields: Optional[str] = None, sort: str = Query("deadline", pattern=f"^-?({'|'.join(SORT_KEYS)})$"),
+                     filters: list = Depends(task_filters), session=Depends(get_session),
+                     user: User = Depends(get_current_user)):
+    """
+    Получить страницу задач текущего пользователя с фильтрами и сортировкой.
+
+    Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа (для того же sort).
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
+        sort (str): Ключ сортировки (deadline или priority), с префиксом "-" — по убыванию.
+        filters (list): Условия из task_filters.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        TaskPage: Страница задач и курсор следующей страницы.
+    """
+    statement = select(Task).where(Task.user_id == user.id, *filters)
+    order_by = (SORT_KEYS[sort.lstrip("-")], Task.id)
+    return await paginate_read(session, statement, TaskRead, order_by, cursor, limit, response, fields,
+                               descending=sort.startswith("-"))
+
+
+@router.get("/search", response_model=TaskPage, dependencies=[Depends(collection_etag("tasks"))])
+async def search_tasks(q: str = Query(..., min_length=1, max_length=200), cursor: Optional[str] = None,
+                       limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT), filters: list = Depends(task_filters),
+                       session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Найти задачи текущего пользователя по словам в названии и описании.
+
+    Результаты упорядочены по релевантности (см. search.search_statement) и
+    постранично выдаются с курсором; фильтры те же, что у списка задач.
+
+    Args:
+        q (str): Строка поиска; должны встретиться все слова.
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        filters (list): Условия из task_filters.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        TaskPage: Страница найденных задач и курсор следующей страницы.
+
+    Raises:
+        HTTPException: Если в строке поиска нет ни одного слова.
+    """
+    statement, score = search_statement(q)
+    page = await paginate(session, statement.where(Task.user_id == user.id, *filters), (score, Task.id), cursor, limit)
+    return {"items": [row.Task for row in page["items"]], "next_cursor": page["next_cursor"]}
+
+
+@router.get("/{task_id}", response_model=TaskRead)
+async def read_task(task_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Получить задачу по идентификатору вместе с накопленным time_spent.
+
+    Args:
+        task_id (int): Идентификатор задачи.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        TaskRead: Данные задачи.
+
+    Raises:
+        HTTPException: Если задача не найдена или принадлежит другому пользователю.
+    """
+    task = await session.get(Task, task_id)
+    if not task or task.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Task not found or unauthorized")
+    return task
 
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_task(task_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить задачу по идентификатору.
 
+    Записи учёта времени задачи (TimeLog) и её дневные итоги (TimeLogDaily) удаляются
+    в той же транзакции, чтобы список записей и статистика не расходились.
+
     Args:
         task_id (int): Идентификатор задачи.
         session (Session): Сессия базы данных.
@@ -69,16 +362,22 @@ def delete_task(task_id: int, session=Depends(get_session), user: User = Depends
     Raises:
         HTTPException: Если задача не найдена или пользователь не авторизован для её удаления.
     """
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task or task.user_id != user.id:
         raise HTTPException(status_code=404, detail="Task not found or unauthorized")
-    session.delete(task)
-    session.commit()
+    log_owners = (await session.execute(
+        delete(TimeLog).where(TimeLog.task_id == task_id).returning(TimeLog.user_id)
+    )).scalars().all()
+    await session.execute(delete(TimeLogDaily).where(TimeLogDaily.task_id == task_id))
+    await session.delete(task)
+    await bump_versions(session, [user.id], "tasks", "timelogs")
+    await bump_versions(session, set(log_owners) - {user.id}, "timelogs")
+    await session.commit()
     return {"ok": True}
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
-def update_task(task_id: int, task_data: TaskCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def update_task(task_id: int, task_data: TaskCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Обновить данные задачи по идентификатору.
 
@@ -94,13 +393,14 @@ def update_task(task_id: int, task_data: TaskCreate, session=Depends(get_session
     Raises:
         HTTPException: Если задача не найдена или пользователь не авторизован для её изменения.
     """
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task or task.user_id != user.id:
         raise HTTPException(status_code=404, detail="Task not found or unauthorized")
     for key, value in task_data.dict(exclude_unset=True).items():
         setattr(task, key, value)
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await bump_versions(session, [user.id], "tasks")
+    await session.commit()
+    await session.refresh(task)
     return task
 
@@ -1,19 +1,34 @@
-from fastapi import Depends, HTTPException, APIRouter
+import csv
+import io
+import json
+
+from fastapi import Depends, HTTPException, APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
 
 from auth import get_current_user
 from models import *
 from sqlmodel import select
+from sqlalchemy import Date, cast, func
 
-from connection import get_session
+from connection import get_session, stream_partitions, dialect_name
+from rollups import apply_timelog
+from serialization import paginate_read
+from pagination import DEFAULT_LIMIT, MAX_LIMIT
+from versions import bump_versions, collection_etag
 
 router = APIRouter(prefix="/timelogs", tags=["Timelogs"])
 
+EXPORT_COLUMNS = ("id", "task_id", "user_id", "start_time", "end_time")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 
 @router.post("/", response_model=TimeLogRead)
-def create_timelog(log: TimeLogCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def create_timelog(log: TimeLogCreate, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Создать новую запись учёта времени для текущего пользователя.
 
+    В той же транзакции длительность записи добавляется к Task.time_spent и дневным итогам.
+
     Args:
         log (TimeLogCreate): Данные новой записи учёта времени.
         session (Session): Сессия базы данных.
@@ -21,34 +36,191 @@ def create_timelog(log: TimeLogCreate, session=Depends(get_session), user: User
 
     Returns:
         TimeLogRead: Данные созданной записи.
+
+    Raises:
+        HTTPException: Если задача не найдена или пользователь не авторизован для неё.
     """
-    db_log = TimeLog(**log.dict(), user_id=user.id)
+    task = await session.get(Task, log.task_id)
+    if not task or task.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Task not found or unauthorized")
+    db_log = TimeLog(**log.dict(exclude={"user_id"}), user_id=user.id)
     session.add(db_log)
-    session.commit()
-    session.refresh(db_log)
+    await apply_timelog(session, db_log)
+    await bump_versions(session, [user.id], "timelogs", "tasks")
+    await session.commit()
+    await session.refresh(db_log)
     return db_log
 
 
-@router.get("/", response_model=List[TimeLogRead])
-def read_timelogs(session=Depends(get_session), user: User = Depends(get_current_user)):
+@router.get("/", response_model=TimeLogPage, dependencies=[Depends(collection_etag("timelogs"))])
+async def read_timelogs(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                        fields: Optional[str] = None, session=Depends(get_session), user: User = Depends(get_current_user)):
+    """
+    Получить страницу записей учёта времени текущего пользователя, отсортированных по времени начала.
+
+    Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
+        session (Session): Сессия базы данных.
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        TimeLogPage: Страница записей учёта времени и курсор следующей страницы.
+    """
+    return await paginate_read(session, select(TimeLog).where(TimeLog.user_id == user.id), TimeLogRead, (TimeLog.start_time, TimeLog.id), cursor, limit, response, fields)
+
+
+def format_partition(rows: list, export_format: str) -> bytes:
+    """
+    Преобразовать пачку строк в фрагмент файла выгрузки.
+
+    Args:
+        rows (list): Строки с колонками EXPORT_COLUMNS.
+        export_format (str): Формат выгрузки: ndjson или csv.
+
+    Returns:
+        bytes: Закодированный фрагмент.
+    """
+    if export_format == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=datetime.isoformat) + "\n" for row in rows
+        ).encode()
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def export_rows(statement, export_format: str):
+    """
+    Сгенерировать файл выгрузки по мере чтения строк из базы.
+
+    Args:
+        statement: Запрос по колонкам EXPORT_COLUMNS.
+        export_format (str): Формат выгрузки: ndjson или csv.
+
+    Yields:
+        bytes: Очередной фрагмент файла.
+    """
+    if export_format == "csv":
+        yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+    async for rows in stream_partitions(statement):
+        yield format_partition(rows, export_format)
+
+
+@router.get("/export")
+async def export_timelogs(export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+                          start: Optional[datetime] = Query(None, alias="from"),
+                          end: Optional[datetime] = Query(None, alias="to"),
+                          user: User = Depends(get_current_user)):
+    """
+    Выгрузить записи учёта времени текущего пользователя потоком в NDJSON или CSV.
+
+    Строки читаются серверным курсором и отдаются клиенту пачками, поэтому память
+    не растёт с объёмом выгрузки, а первый байт уходит сразу.
+
+    Args:
+        export_format (str): Формат выгрузки: ndjson или csv.
+        start (Optional[datetime]): Начало периода (по start_time, включительно).
+        end (Optional[datetime]): Конец периода (по start_time, не включительно).
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        StreamingResponse: Поток с файлом выгрузки.
+    """
+    statement = select(*(getattr(TimeLog, column) for column in EXPORT_COLUMNS)).where(TimeLog.user_id == user.id)
+    if start:
+        statement = statement.where(TimeLog.start_time >= start)
+    if end:
+        statement = statement.where(TimeLog.start_time < end)
+    statement = statement.order_by(TimeLog.start_time, TimeLog.id)
+    return StreamingResponse(
+        export_rows(statement, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=timelogs.{export_format}"},
+    )
+
+
+def bucket_expression(bucket: str):
+    """
+    Получить SQL-выражение начала периода для дня из TimeLogDaily.
+
+    Args:
+        bucket (str): Период: day, week, month или year.
+
+    Returns:
+        SQL-выражение даты начала периода (недели начинаются с понедельника).
+    """
+    if dialect_name == "sqlite":
+        modifiers = {"day": (), "week": ("-6 days", "weekday 1"), "month": ("start of month",), "year": ("start of year",)}
+        return func.date(TimeLogDaily.day, *modifiers[bucket])
+    if bucket == "day":
+        return TimeLogDaily.day
+    return cast(func.date_trunc(bucket, TimeLogDaily.day), Date)
+
+
+@router.get("/stats", response_model=List[TimeLogStat],
+            dependencies=[Depends(collection_etag("timelogs", "tasks", "projects", "tags"))])
+async def timelog_stats(group_by: str = Query("task", pattern="^(task|project|tag|none)$"),
+                        bucket: str = Query("day", pattern="^(day|week|month|year|total)$"),
+                        start: Optional[date] = Query(None, alias="from"),
+                        end: Optional[date] = Query(None, alias="to"),
+                        session=Depends(get_session), user: User = Depends(get_current_user)):
     """
-    Получить список всех записей учёта времени текущего пользователя.
+    Получить суммарное время текущего пользователя по периодам и задачам, проектам или тегам.
+
+    Считается в SQL по таблице дневных итогов TimeLogDaily, поэтому годовой отчёт
+    читает не больше 365 строк на задачу. Задача, входящая в несколько проектов
+    или имеющая несколько тегов, учитывается в каждом из них. ETag зависит и от задач,
+    проектов и тегов: их изменения меняют дневные итоги и связи, по которым идёт группировка.
 
     Args:
+        group_by (str): Группировка: task, project, tag или none.
+        bucket (str): Период: day, week, month, year или total (без разбивки).
+        start (Optional[date]): Первый день отчёта (включительно).
+        end (Optional[date]): Последний день отчёта (не включительно).
         session (Session): Сессия базы данных.
         user (User): Авторизованный пользователь.
 
     Returns:
-        List[TimeLogRead]: Список записей учёта времени.
+        List[TimeLogStat]: Суммы времени, отсортированные по периоду и ключу.
     """
-    return session.exec(select(TimeLog).where(TimeLog.user_id == user.id)).all()
+    keys = {
+        "task": TimeLogDaily.task_id,
+        "project": ProjectTaskLink.project_id,
+        "tag": TagTaskLink.tag_id,
+        "none": None,
+    }
+    columns = {}
+    if bucket != "total":
+        columns["bucket"] = bucket_expression(bucket)
+    if keys[group_by] is not None:
+        columns["key"] = keys[group_by]
+    statement = select(*(column.label(name) for name, column in columns.items()),
+                       func.coalesce(func.sum(TimeLogDaily.seconds), 0).label("seconds"))
+    if group_by == "project":
+        statement = statement.join(ProjectTaskLink, ProjectTaskLink.task_id == TimeLogDaily.task_id)
+    if group_by == "tag":
+        statement = statement.join(TagTaskLink, TagTaskLink.task_id == TimeLogDaily.task_id)
+    statement = statement.where(TimeLogDaily.user_id == user.id)
+    if start:
+        statement = statement.where(TimeLogDaily.day >= start)
+    if end:
+        statement = statement.where(TimeLogDaily.day < end)
+    statement = statement.group_by(*columns.values()).order_by(*columns.values())
+    return (await session.execute(statement)).mappings().all()
 
 
 @router.delete("/{log_id}")
-def delete_timelog(log_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_timelog(log_id: int, session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить запись учёта времени по идентификатору.
 
+    В той же транзакции длительность записи вычитается из Task.time_spent и дневных итогов.
+
     Args:
         log_id (int): Идентификатор записи.
         session (Session): Сессия базы данных.
@@ -60,10 +232,12 @@ def delete_timelog(log_id: int, session=Depends(get_session), user: User = Depen
     Raises:
         HTTPException: Если запись не найдена или пользователь не авторизован для её удаления.
     """
-    log = session.get(TimeLog, log_id)
+    log = await session.get(TimeLog, log_id)
     if not log or log.user_id != user.id:
         raise HTTPException(status_code=404, detail="TimeLog not found or unauthorized")
-    session.delete(log)
-    session.commit()
+    await apply_timelog(session, log, -1)
+    await session.delete(log)
+    await bump_versions(session, [user.id], "timelogs", "tasks")
+    await session.commit()
     return {"ok": True}
 
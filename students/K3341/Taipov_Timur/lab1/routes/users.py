@@ -1,33 +1,42 @@
 from datetime import timedelta
 
-from fastapi import Depends, HTTPException, APIRouter
+from fastapi import Depends, HTTPException, APIRouter, Query, Response
 from sqlalchemy.exc import IntegrityError
 
-from auth import hash_password, verify_passwd, create_access_token, get_current_user
+from auth import hash_password_async, verify_passwd_async, create_access_token, get_current_user
+from auth import principal_cache, token_cache
 from models import *
 from sqlmodel import select
 
 from connection import get_session
+from response_cache import projects_cache
+from serialization import paginate_read
+from pagination import DEFAULT_LIMIT, MAX_LIMIT
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("/", response_model=List[UserRead])
-def users_list(session=Depends(get_session)):
+@router.get("/", response_model=UserPage)
+async def users_list(response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                     fields: Optional[str] = None, session=Depends(get_session)):
     """
-    Получить список всех пользователей.
+    Получить страницу пользователей.
 
     Args:
+        response (Response): Ответ с заголовками зависимостей (для быстрого пути).
+        cursor (Optional[str]): Курсор следующей страницы из предыдущего ответа.
+        limit (int): Размер страницы.
+        fields (Optional[str]): Поля элементов через запятую (например, "id,name"); остальные колонки не выбираются.
         session (Session): Сессия базы данных.
 
     Returns:
-        List[UserRead]: Список пользователей.
+        UserPage: Страница пользователей и курсор следующей страницы.
     """
-    return session.exec(select(User)).all()
+    return await paginate_read(session, select(User), UserRead, (User.id,), cursor, limit, response, fields)
 
 
 @router.post("/register")
-def register(user: UserCreate, session=Depends(get_session)):
+async def register(user: UserCreate, session=Depends(get_session)):
     """
     Зарегистрировать нового пользователя.
 
@@ -42,11 +51,11 @@ def register(user: UserCreate, session=Depends(get_session)):
         HTTPException: Если пользователь с таким именем уже существует.
     """
     try:
-        new_data = {"password": hash_password(user.password)}
+        new_data = {"password": await hash_password_async(user.password)}
         user = User.model_validate(user, update=new_data)
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
         return {"status": 200, "data": user}
     except IntegrityError:
         raise HTTPException(
@@ -56,7 +65,7 @@ def register(user: UserCreate, session=Depends(get_session)):
 
 
 @router.patch("/update")
-def reset_password(user: UserUpdate, authorised_user: User = Depends(get_current_user), session=Depends(get_session)):
+async def reset_password(user: UserUpdate, authorised_user: User = Depends(get_current_user), session=Depends(get_session)):
     """
     Сбросить или изменить пароль авторизованного пользователя.
 
@@ -70,17 +79,18 @@ def reset_password(user: UserUpdate, authorised_user: User = Depends(get_current
     """
     user_data = user.model_dump(exclude_unset=True)
     password = user_data["password"]
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
     user_data.update({"password": hashed_password})
-    authorised_user.sqlmodel_update(user_data)
-    session.add(authorised_user)
-    session.commit()
-    session.refresh(authorised_user)
+    db_user = await session.get(User, authorised_user.id)
+    db_user.sqlmodel_update(user_data)
+    session.add(db_user)
+    await session.commit()
+    principal_cache.invalidate(authorised_user.name)
     return {"status": 200}
 
 
 @router.post("/login")
-def login(user: UserLogin, session=Depends(get_session)):
+async def login(user: UserLogin, session=Depends(get_session)):
     """
     Авторизация пользователя и получение JWT токена.
 
@@ -95,8 +105,8 @@ def login(user: UserLogin, session=Depends(get_session)):
         HTTPException: Если имя пользователя или пароль неверны.
     """
     username = user.name
-    hashed_password = session.exec(select(User.password).where(User.name == username)).first()
-    result = verify_passwd(user.password, hashed_password)
+    hashed_password = (await session.exec(select(User.password).where(User.name == username))).first()
+    result = hashed_password is not None and await verify_passwd_async(user.password, hashed_password)
     if not result:
         raise HTTPException(status_code=401, detail="Incorrect password or username")
     payload = {"sub": user.name, "exp": datetime.utcnow() + timedelta(minutes=10)}
@@ -105,7 +115,7 @@ def login(user: UserLogin, session=Depends(get_session)):
 
 
 @router.get("/me", response_model=UserRead)
-def me(current_user=Depends(get_current_user)):
+async def me(current_user=Depends(get_current_user)):
     """
     Получить данные текущего авторизованного пользователя.
 
@@ -119,7 +129,7 @@ def me(current_user=Depends(get_current_user)):
 
 
 @router.delete("/me")
-def delete_current_user(session=Depends(get_session), user: User = Depends(get_current_user)):
+async def delete_current_user(session=Depends(get_session), user: User = Depends(get_current_user)):
     """
     Удалить аккаунт текущего авторизованного пользователя.
 
@@ -130,7 +140,23 @@ def delete_current_user(session=Depends(get_session), user: User = Depends(get_c
     Returns:
         dict: Подтверждение успешного удаления.
     """
-    session.delete(user)
-    session.commit()
+    await session.delete(await session.get(User, user.id))
+    await session.commit()
+    principal_cache.invalidate(user.name)
+    await projects_cache.invalidate(user.id)
     return {"ok": True}
 
+
+@router.get("/auth-cache")
+async def auth_cache_stats(user: User = Depends(get_current_user)):
+    """
+    Получить статистику кэшей авторизованных пользователей и проверенных токенов.
+
+    Args:
+        user (User): Авторизованный пользователь.
+
+    Returns:
+        dict: Размер кэша пользователей, число попаданий и промахов; то же для токенов в tokens.
+    """
+    return {**principal_cache.stats(), "tokens": token_cache.stats()}
+
@@ -0,0 +1,216 @@
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import update
+from sqlmodel import select
+
+from connection import open_session, stream_partitions
+from models import Notification
+from versions import bump_versions
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_SCHEDULER = os.getenv("NOTIFICATION_SCHEDULER", "1") == "1"
+NOTIFICATION_WINDOW = timedelta(minutes=float(os.getenv("NOTIFICATION_WINDOW_MINUTES", "60")))
+DISPATCH_BATCH_SIZE = 1000
+RETRY_DELAY = 5
+
+
+async def log_dispatch(ids: List[int]) -> None:
+    """
+    Обработчик отправки по умолчанию: записать идентификаторы в лог.
+
+    Args:
+        ids (List[int]): Идентификаторы отправленных уведомлений.
+    """
+    logger.info("Dispatched notifications: %s", ids)
+
+
+class NotificationScheduler:
+    """
+    Планировщик напоминаний на основе кучи таймеров.
+
+    В памяти держатся только неотправленные напоминания с remind_at внутри окна
+    window (выборка по частичному индексу ix_notification_pending_remind_at).
+    Планировщик спит до ближайшего remind_at, помечает наступившие напоминания
+    как отправленные одним UPDATE и передаёт их обработчику. Окно подгружается
+    заново, когда до его конца остаётся половина.
+
+    Удаление реализовано лениво: отменённые записи остаются в куче и
+    пропускаются при извлечении, если их нет в _pending.
+
+    Attributes:
+        window (timedelta): Ширина окна загрузки.
+        handler (Callable): Корутина, получающая идентификаторы отправленных уведомлений.
+        dispatched (int): Число отправленных уведомлений.
+    """
+
+    def __init__(self, window: timedelta = NOTIFICATION_WINDOW,
+                 handler: Callable[[List[int]], Awaitable[None]] = log_dispatch):
+        self.window = window
+        self.handler = handler
+        self.dispatched = 0
+        self._heap: List[Tuple[datetime, int]] = []
+        self._pending: Dict[int, datetime] = {}
+        self._loaded_until: Optional[datetime] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(self, notification_id: int, remind_at: datetime) -> None:
+        """
+        Добавить созданное уведомление, если оно попадает в загруженное окно.
+
+        Уведомления за пределами окна будут выбраны из базы при следующей загрузке.
+
+        Args:
+            notification_id (int): Идентификатор уведомления.
+            remind_at (datetime): Время напоминания.
+        """
+        if self._loaded_until is None or remind_at >= self._loaded_until:
+            return
+        self._pending[notification_id] = remind_at
+        heapq.heappush(self._heap, (remind_at, notification_id))
+        if self._heap[0][1] == notification_id:
+            self._wakeup.set()
+
+    def cancel(self, notification_id: int) -> None:
+        """
+        Отменить напоминание удалённого уведомления.
+
+        Args:
+            notification_id (int): Идентификатор уведомления.
+        """
+        self._pending.pop(notification_id, None)
+
+    async def load(self, now: datetime) -> None:
+        """
+        Загрузить неотправленные напоминания до now + window.
+
+        Окно считается загруженным только после успешного чтения всех строк: при ошибке
+        граница окна возвращается к прежней, и следующая загрузка повторяет то же окно
+        (уже загруженные напоминания не задваиваются, см. pop_due). Граница сдвигается до
+        чтения, чтобы уведомления, созданные во время загрузки, добавлял schedule.
+
+        Args:
+            now (datetime): Текущее время (UTC).
+        """
+        until = now + self.window
+        statement = select(Notification.id, Notification.remind_at).where(
+            Notification.dispatched_at.is_(None), Notification.remind_at < until
+        )
+        loaded_until = self._loaded_until
+        if loaded_until is not None:
+            statement = statement.where(Notification.remind_at >= loaded_until)
+        self._loaded_until = until
+        try:
+            async for rows in stream_partitions(statement, 10000):
+                for notification_id, remind_at in rows:
+                    self._pending[notification_id] = remind_at
+                    self._heap.append((remind_at, notification_id))
+        except BaseException:
+            self._loaded_until = loaded_until
+            raise
+        finally:
+            heapq.heapify(self._heap)
+
+    def pop_due(self, now: datetime) -> List[Tuple[datetime, int]]:
+        """
+        Извлечь из кучи наступившие напоминания (не больше DISPATCH_BATCH_SIZE).
+
+        Args:
+            now (datetime): Текущее время (UTC).
+
+        Returns:
+            List[Tuple[datetime, int]]: Время напоминания и идентификатор уведомления.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < DISPATCH_BATCH_SIZE:
+            remind_at, notification_id = heapq.heappop(self._heap)
+            if self._pending.get(notification_id) == remind_at:
+                del self._pending[notification_id]
+                due.append((remind_at, notification_id))
+        return due
+
+    async def dispatch(self, ids: List[int]) -> List[int]:
+        """
+        Пометить уведомления отправленными и передать их обработчику.
+
+        Условие dispatched_at IS NULL гарантирует, что при нескольких воркерах
+        каждое уведомление отправит только один из них. В той же транзакции
+        увеличиваются версии списков уведомлений владельцев (ETag).
+
+        Args:
+            ids (List[int]): Идентификаторы наступивших уведомлений.
+
+        Returns:
+            List[int]: Идентификаторы, которые пометил этот планировщик.
+        """
+        async with open_session() as session:
+            result = await session.execute(
+                update(Notification)
+                .where(Notification.id.in_(ids), Notification.dispatched_at.is_(None))
+                .values(dispatched_at=datetime.utcnow())
+                .returning(Notification.id, Notification.user_id)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            ids = [row.id for row in rows]
+            await bump_versions(session, [row.user_id for row in rows], "notifications")
+            await session.commit()
+        if ids:
+            await self.handler(ids)
+            self.dispatched += len(ids)
+        return ids
+
+    async def run(self) -> None:
+        """Основной цикл: загрузка окна, ожидание ближайшего напоминания и отправка."""
+        while True:
+            now = datetime.utcnow()
+            due = []
+            try:
+                if self._loaded_until is None or now >= self._loaded_until - self.window / 2:
+                    await self.load(now)
+                due = self.pop_due(now)
+                if due:
+                    await self.dispatch([notification_id for _, notification_id in due])
+                    continue
+            except Exception:
+                logger.exception("Notification dispatch failed")
+                for remind_at, notification_id in due:
+                    self.schedule(notification_id, remind_at)
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            next_at = self._loaded_until - self.window / 2
+            if self._heap:
+                next_at = min(next_at, self._heap[0][0])
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max((next_at - now).total_seconds(), 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Запустить планировщик фоновой задачей в текущем цикле событий."""
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Остановить планировщик."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+notification_scheduler = NotificationScheduler()
@@ -0,0 +1,77 @@
+"""
+Вывести планы выполнения (EXPLAIN) запросов, которые выполняют роутеры.
+
+Запускается из каталога lab1 до и после `alembic upgrade head`, чтобы сравнить планы:
+    python -m scripts.explain_queries --user-id 1
+"""
+import argparse
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlmodel import select
+
+from connection import engine
+from models import *
+
+
+def router_queries(user_id: int) -> dict:
+    """
+    Собрать запросы роутеров в том виде, в котором они уходят в базу.
+
+    Args:
+        user_id (int): Идентификатор пользователя, для которого строятся запросы.
+
+    Returns:
+        dict: Название запроса и сам запрос.
+    """
+    moment = datetime(2025, 1, 1)
+    return {
+        "auth: user by name": select(User).where(User.name == "name"),
+        "GET /users/": select(User).order_by(User.id).limit(51),
+        "GET /tasks": select(Task).where(Task.user_id == user_id).order_by(Task.deadline, Task.id).limit(51),
+        "GET /tasks (next page)": select(Task).where(Task.user_id == user_id)
+        .where(tuple_(Task.deadline, Task.id) > tuple_(moment, 1)).order_by(Task.deadline, Task.id).limit(51),
+        "GET /projects/": select(Project).where(Project.user_id == user_id).order_by(Project.id).limit(51),
+        "GET /projects/ (selectinload tasks)": select(ProjectTaskLink.project_id, Task)
+        .join(Task, Task.id == ProjectTaskLink.task_id).where(ProjectTaskLink.project_id.in_([1, 2, 3])),
+        "GET /tags/": select(Tag).where(Tag.user_id == user_id).order_by(Tag.id).limit(51),
+        "tasks by tag": select(TagTaskLink.task_id).where(TagTaskLink.tag_id == 1),
+        "GET /timelogs/": select(TimeLog).where(TimeLog.user_id == user_id)
+        .order_by(TimeLog.start_time, TimeLog.id).limit(51),
+        "timelogs of task": select(TimeLog).where(TimeLog.task_id == 1).order_by(TimeLog.start_time),
+        "GET /routines/": select(Routine).where(Routine.user_id == user_id).order_by(Routine.id).limit(51),
+        "GET /notifications/": select(Notification).where(Notification.user_id == user_id)
+        .order_by(Notification.remind_at, Notification.id).limit(51),
+        "notifications of task": select(Notification).where(Notification.task_id == 1),
+    }
+
+
+def explain(statement) -> list:
+    """
+    Получить план выполнения запроса для текущей базы данных.
+
+    Args:
+        statement: Запрос SQLAlchemy.
+
+    Returns:
+        list: Строки плана.
+    """
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(prefix + str(compiled), params).all()
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user-id", type=int, default=1, help="пользователь, для которого строятся запросы")
+    args = parser.parse_args()
+    for title, statement in router_queries(args.user_id).items():
+        print(f"== {title}")
+        for line in explain(statement):
+            print(f"   {line}")
@@ -0,0 +1,328 @@
+"""
+Сгенерировать синтетические данные в объёме продакшена и быстро загрузить их в базу DB_URL.
+
+Создаются пользователи, проекты, теги, задачи, связи задач с проектами и тегами,
+записи времени, рутины и уведомления с согласованными внешними ключами. Распределения
+фиксируются зерном --seed: число задач у пользователя убывает по закону Ципфа,
+статусы, приоритеты и длительности записей времени неравномерны. Задачи генерируются
+пачками, а зависимые строки пачки загружаются сразу за ней, поэтому память не растёт
+с объёмом. Загрузка идёт одной транзакцией: COPY на Postgres и executemany через
+DBAPI на SQLite. В конце пересчитываются TimeLogDaily и Task.time_spent и печатается
+скорость загрузки в строках в секунду. База должна быть пустой (или --recreate).
+У всех пользователей (user1, user2, ...) пароль --password.
+Запуск из каталога lab1:
+    python -m scripts.generate_data --users 10000 --tasks-per-user 100 --recreate
+"""
+import argparse
+import io
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from enum import Enum
+from math import log
+from random import Random
+
+from sqlalchemy import func, select
+from sqlmodel import Session, SQLModel
+
+from auth import hash_password
+from connection import dialect_name, engine
+from models import (TASK_SEARCH_DDL, Notification, Project, ProjectTaskLink, Routine, RoutineType, Tag, TagTaskLink, Task,
+                    TaskStatus, TimeLog, User)
+from rollups import rebuild_timelog_daily, recompute_time_spent
+
+START = datetime(2026, 1, 1)
+NOW = datetime(2026, 10, 17)
+WORDS = ["report", "review", "deploy", "design", "meeting", "invoice", "backup", "release", "draft", "audit",
+         "budget", "hiring", "roadmap", "migration", "support", "research", "testing", "refactor", "training", "sync"]
+COLORS = ["red", "orange", "yellow", "green", "blue", "purple", "gray"]
+STATUSES = ([TaskStatus.active, TaskStatus.completed, TaskStatus.archived], [6, 3, 1])
+FREQUENCIES = ([RoutineType.daily, RoutineType.weekly, RoutineType.monthly], [5, 4, 1])
+TAGS_PER_TASK = ([0, 1, 2, 3], [3, 4, 2, 1])
+USER_SKEW = 0.8
+ROUTINE_SHARE = 0.05
+NOTIFICATION_SHARE = 0.2
+# Колонки каждой таблицы в порядке значений в генерируемых кортежах.
+COLUMNS = {
+    User: ("id", "name", "email", "password"),
+    Project: ("id", "name", "description", "user_id"),
+    Tag: ("id", "name", "color", "user_id"),
+    Task: ("id", "name", "description", "status", "difficulty", "priority", "deadline", "user_id"),
+    ProjectTaskLink: ("task_id", "project_id"),
+    TagTaskLink: ("task_id", "tag_id"),
+    TimeLog: ("id", "task_id", "user_id", "start_time", "end_time"),
+    Routine: ("id", "name", "frequency", "count", "task_id", "user_id", "generated_count"),
+    Notification: ("id", "user_id", "task_id", "remind_at", "dispatched_at"),
+}
+
+
+def task_counts(users: int, tasks_per_user: int) -> list[int]:
+    """
+    Распределить users * tasks_per_user задач между пользователями по закону Ципфа.
+
+    Пользователь 1 получает больше всего задач, у последних пользователей их единицы.
+
+    Args:
+        users (int): Количество пользователей.
+        tasks_per_user (int): Среднее число задач на пользователя.
+
+    Returns:
+        list[int]: Число задач каждого пользователя.
+    """
+    weights = [1 / rank ** USER_SKEW for rank in range(1, users + 1)]
+    total, scale = users * tasks_per_user, users * tasks_per_user / sum(weights)
+    counts = [max(1, int(weight * scale)) for weight in weights]
+    for index in range(max(0, total - sum(counts))):
+        counts[index % users] += 1
+    return counts
+
+
+class Generator:
+    """
+    Генератор строк всех таблиц с фиксированным зерном.
+
+    Идентификаторы назначаются последовательно с 1, поэтому строки зависимых таблиц
+    ссылаются на уже сгенерированные строки без обращений к базе.
+
+    Attributes:
+        users (int): Количество пользователей.
+        counts (list[int]): Число задач каждого пользователя.
+        tags_per_user (int): Тегов у пользователя.
+        projects_per_user (int): Проектов у пользователя.
+        timelogs_per_task (float): Среднее число записей времени на задачу.
+        password (str): Хеш пароля всех пользователей.
+    """
+
+    def __init__(self, args: argparse.Namespace, password: str):
+        self.rng = Random(args.seed)
+        self.users = args.users
+        self.counts = task_counts(args.users, args.tasks_per_user)
+        self.tags_per_user = args.tags_per_user
+        self.projects_per_user = args.projects_per_user
+        self.timelogs_per_task = args.timelogs_per_task
+        self.password = password
+        self.timelog_id = self.routine_id = self.notification_id = 0
+
+    def users_rows(self):
+        """Строки User."""
+        for user in range(1, self.users + 1):
+            yield user, f"user{user}", f"user{user}@example.com", self.password
+
+    def projects_rows(self):
+        """Строки Project: projects_per_user проектов у каждого пользователя."""
+        for user in range(1, self.users + 1):
+            for index in range(self.projects_per_user):
+                project_id = (user - 1) * self.projects_per_user + index + 1
+                yield project_id, f"{self.rng.choice(WORDS)} project {index + 1}", "", user
+
+    def tags_rows(self):
+        """Строки Tag: tags_per_user тегов у каждого пользователя."""
+        for user in range(1, self.users + 1):
+            for index in range(self.tags_per_user):
+                yield (user - 1) * self.tags_per_user + index + 1, f"{WORDS[index % len(WORDS)]} {index + 1}", \
+                    self.rng.choice(COLORS), user
+
+    def task_chunks(self, chunk_size: int):
+        """
+        Сгенерировать задачи пачками вместе со строками зависимых таблиц.
+
+        Args:
+            chunk_size (int): Примерное число задач в пачке.
+
+        Yields:
+            dict: Строки пачки по моделям в порядке загрузки (сначала Task).
+        """
+        rng, task_id = self.rng, 0
+        chunk = defaultdict(list)
+        for user, count in enumerate(self.counts, start=1):
+            for _ in range(count):
+                task_id += 1
+                deadline = START + timedelta(minutes=rng.randrange(525600))
+                status = rng.choices(*STATUSES)[0]
+                chunk[Task].append((
+                    task_id, " ".join(rng.sample(WORDS, rng.randint(2, 4))), " ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+                    status, rng.randint(1, 5), min(5, max(1, round(rng.gauss(3, 1)))), deadline, user,
+                ))
+                self.task_links(chunk, task_id, user)
+                self.task_dependents(chunk, task_id, user, deadline)
+                if len(chunk[Task]) >= chunk_size:
+                    yield chunk
+                    chunk = defaultdict(list)
+        if chunk:
+            yield chunk
+
+    def task_links(self, chunk: dict, task_id: int, user: int) -> None:
+        """Добавить связи задачи с проектами пользователя (обычно один) и 0–3 его тегами."""
+        rng = self.rng
+        if self.projects_per_user and rng.random() < 0.9:
+            first = (user - 1) * self.projects_per_user + 1
+            for project in rng.sample(range(self.projects_per_user), min(self.projects_per_user, rng.choice((1, 1, 1, 2)))):
+                chunk[ProjectTaskLink].append((task_id, first + project))
+        if self.tags_per_user:
+            first = (user - 1) * self.tags_per_user + 1
+            count = min(self.tags_per_user, rng.choices(*TAGS_PER_TASK)[0])
+            for tag in rng.sample(range(self.tags_per_user), count):
+                chunk[TagTaskLink].append((task_id, first + tag))
+
+    def task_dependents(self, chunk: dict, task_id: int, user: int, deadline: datetime) -> None:
+        """Добавить записи времени, рутину и уведомление задачи."""
+        rng = self.rng
+        for _ in range(int(rng.expovariate(1 / self.timelogs_per_task)) if self.timelogs_per_task else 0):
+            day = deadline - timedelta(days=rng.randrange(90))
+            begin = day.replace(hour=rng.randint(8, 19), minute=rng.randrange(60), second=0)
+            seconds = min(8 * 3600, int(rng.lognormvariate(log(1800), 0.8)))
+            self.timelog_id += 1
+            chunk[TimeLog].append((self.timelog_id, task_id, user, begin, begin + timedelta(seconds=seconds)))
+        if rng.random() < ROUTINE_SHARE:
+            self.routine_id += 1
+            chunk[Routine].append((self.routine_id, f"routine {self.routine_id}", rng.choices(*FREQUENCIES)[0],
+                                   rng.randint(5, 30), task_id, user, 0))
+        if rng.random() < NOTIFICATION_SHARE:
+            self.notification_id += 1
+            remind_at = deadline - timedelta(hours=rng.choice((1, 24, 72)))
+            chunk[Notification].append((self.notification_id, user, task_id, remind_at,
+                                        remind_at if remind_at < NOW else None))
+
+
+def copy_value(value) -> str:
+    """
+    Представить значение в текстовом формате COPY Postgres.
+
+    Args:
+        value: Значение колонки.
+
+    Returns:
+        str: Текст поля (\\N для NULL, спецсимволы экранированы).
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class Loader:
+    """
+    Загрузчик строк самым быстрым способом бэкенда в одной транзакции.
+
+    На Postgres строки пишутся через COPY FROM STDIN (psycopg2 или psycopg 3), на SQLite —
+    через executemany курсора DBAPI со значениями, подготовленными обработчиками типов
+    SQLAlchemy (в том же формате, что пишет приложение). На SQLite триггеры индекса FTS5
+    на время загрузки удаляются, а индекс один раз перестраивается перед фиксацией.
+
+    Attributes:
+        rows (dict): Загружено строк по таблицам.
+        seconds (dict): Время загрузки по таблицам.
+    """
+
+    def __init__(self):
+        self.connection = engine.raw_connection()
+        self.cursor = self.connection.cursor()
+        self.rows, self.seconds = defaultdict(int), defaultdict(float)
+        self.triggers = [statement for statement in TASK_SEARCH_DDL["sqlite"] if statement.startswith("CREATE TRIGGER")]
+        if dialect_name == "sqlite":
+            self.cursor.execute("PRAGMA synchronous = OFF")
+            for statement in self.triggers:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {statement.split()[2]}")
+
+    def load(self, model, rows: list) -> None:
+        """
+        Загрузить строки одной таблицы.
+
+        Args:
+            model: Табличная модель.
+            rows (list): Кортежи значений в порядке COLUMNS[model].
+        """
+        if not rows:
+            return
+        table, columns = model.__table__, COLUMNS[model]
+        began = time.perf_counter()
+        if dialect_name == "postgresql":
+            data = "".join("\t".join(map(copy_value, row)) + "\n" for row in rows)
+            statement = f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN'
+            if hasattr(self.cursor, "copy_expert"):
+                self.cursor.copy_expert(statement, io.StringIO(data))
+            else:
+                with self.cursor.copy(statement) as copy:
+                    copy.write(data)
+        else:
+            types = [table.c[column].type.dialect_impl(engine.dialect) for column in columns]
+            processors = [column_type.bind_processor(engine.dialect) for column_type in types]
+            values = [
+                tuple(value if processor is None else processor(value) for processor, value in zip(processors, row))
+                for row in rows
+            ]
+            placeholders = ", ".join("?" for _ in columns)
+            self.cursor.executemany(f'INSERT INTO "{table.name}" ({", ".join(columns)}) VALUES ({placeholders})', values)
+        self.seconds[table.name] += time.perf_counter() - began
+        self.rows[table.name] += len(rows)
+
+    def commit(self) -> None:
+        """Зафиксировать транзакцию: на Postgres сдвинуть последовательности, на SQLite вернуть поиск."""
+        if dialect_name == "postgresql":
+            for model, columns in COLUMNS.items():
+                if "id" in columns:
+                    name = model.__table__.name
+                    self.cursor.execute(
+                        f"SELECT setval(pg_get_serial_sequence('\"{name}\"', 'id'), "
+                        f"coalesce((SELECT max(id) FROM \"{name}\"), 0) + 1, false)"
+                    )
+        else:
+            began = time.perf_counter()
+            for statement in self.triggers:
+                self.cursor.execute(statement)
+            self.cursor.execute("INSERT INTO task_fts (task_fts) VALUES ('rebuild')")
+            self.seconds["task_fts"] += time.perf_counter() - began
+            self.rows["task_fts"] = self.rows["task"]
+        self.connection.commit()
+        self.connection.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.recreate:
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.exec(select(func.count()).select_from(User)).one()[0]:
+            sys.exit("database is not empty, use --recreate")
+    generator = Generator(args, hash_password(args.password))
+    loader = Loader()
+    began = time.perf_counter()
+    loader.load(User, list(generator.users_rows()))
+    loader.load(Project, list(generator.projects_rows()))
+    loader.load(Tag, list(generator.tags_rows()))
+    for chunk in generator.task_chunks(args.chunk_size):
+        for model in (Task, ProjectTaskLink, TagTaskLink, TimeLog, Routine, Notification):
+            loader.load(model, chunk[model])
+        print(f"tasks: {loader.rows['task']}", end="\r", flush=True)
+    loader.commit()
+    elapsed = time.perf_counter() - began
+    print(f"{'table':>16} {'rows':>10} {'load s':>8} {'rows/s':>10}")
+    for name, rows in loader.rows.items():
+        print(f"{name:>16} {rows:>10} {loader.seconds[name]:>8.2f} {rows / max(loader.seconds[name], 1e-9):>10.0f}")
+    total = sum(loader.rows.values())
+    print(f"{'total':>16} {total:>10} {elapsed:>8.2f} {total / elapsed:>10.0f} (with generation)")
+    if not args.skip_rollups:
+        began = time.perf_counter()
+        with Session(engine) as session:
+            daily = rebuild_timelog_daily(session)
+            recompute_time_spent(session)
+        print(f"rollups: {daily} daily rows, {time.perf_counter() - began:.1f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000, help="количество пользователей")
+    parser.add_argument("--tasks-per-user", type=int, default=100, help="среднее число задач на пользователя")
+    parser.add_argument("--tags-per-user", type=int, default=20, help="тегов у каждого пользователя")
+    parser.add_argument("--projects-per-user", type=int, default=5, help="проектов у каждого пользователя")
+    parser.add_argument("--timelogs-per-task", type=float, default=2.0, help="среднее число записей времени на задачу")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="задач в одной пачке загрузки")
+    parser.add_argument("--password", default="password", help="пароль всех пользователей")
+    parser.add_argument("--recreate", action="store_true", help="удалить и заново создать все таблицы")
+    parser.add_argument("--skip-rollups", action="store_true", help="не пересчитывать TimeLogDaily и time_spent")
+    main(parser.parse_args())
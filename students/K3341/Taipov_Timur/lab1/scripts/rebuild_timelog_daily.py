@@ -0,0 +1,21 @@
+"""
+Пересобрать таблицу дневных итогов TimeLogDaily по всем записям учёта времени.
+
+Запуск из каталога lab1:
+    python -m scripts.rebuild_timelog_daily
+"""
+import argparse
+
+from sqlmodel import Session
+
+from connection import engine
+from rollups import rebuild_timelog_daily
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=10000, help="размер пачки при чтении и записи")
+    args = parser.parse_args()
+    with Session(engine) as session:
+        rows = rebuild_timelog_daily(session, args.batch_size)
+    print(f"daily rows: {rows}")
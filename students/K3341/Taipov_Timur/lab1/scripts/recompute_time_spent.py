@@ -0,0 +1,21 @@
+"""
+Пересчитать Task.time_spent по записям учёта времени и исправить расхождения.
+
+Запуск из каталога lab1:
+    python -m scripts.recompute_time_spent [--task-id 42]
+"""
+import argparse
+
+from sqlmodel import Session
+
+from connection import engine
+from rollups import recompute_time_spent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--task-id", type=int, default=None, help="пересчитать только одну задачу")
+    args = parser.parse_args()
+    with Session(engine) as session:
+        fixed = recompute_time_spent(session, args.task_id)
+    print(f"fixed tasks: {fixed}")
@@ -0,0 +1,80 @@
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import Float, column, func, literal_column, table
+from sqlmodel import select
+
+from connection import dialect_name
+from models import Task
+
+SEARCH_OBJECTS = {"search_vector", "ix_task_search_vector"}
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """
+    Фильтр alembic autogenerate: не трогать объекты полнотекстового поиска.
+
+    Колонка search_vector, её индекс и таблицы FTS5 (task_fts*) создаются DDL из
+    models.TASK_SEARCH_DDL и отдельной миграцией, а не описаны колонками моделей.
+
+    Returns:
+        bool: False для объектов поиска.
+    """
+    return not (name in SEARCH_OBJECTS or (type_ == "table" and name.startswith("task_fts")))
+
+
+def match_query(q: str) -> str:
+    """
+    Превратить пользовательскую строку в запрос FTS5: все слова должны встретиться.
+
+    Каждое слово берётся в кавычки, поэтому операторы FTS5 во вводе не интерпретируются.
+
+    Args:
+        q (str): Строка поиска.
+
+    Returns:
+        str: Выражение для MATCH.
+
+    Raises:
+        HTTPException: Если в строке нет ни одного слова.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search_statement(q: str):
+    """
+    Построить запрос полнотекстового поиска задач с оценкой релевантности.
+
+    На Postgres используется колонка search_vector (GIN-индекс ix_task_search_vector)
+    и ts_rank_cd, на SQLite — таблица FTS5 task_fts и bm25. Совпадения в названии
+    весят больше, чем в описании. Оценка score тем меньше, чем релевантнее задача,
+    поэтому сортировка (score, id) по возрастанию подходит для keyset-пагинации.
+
+    Args:
+        q (str): Строка поиска.
+
+    Returns:
+        tuple: Запрос select(Task, score, Task.id) и колонка score.
+
+    Raises:
+        HTTPException: Если в строке нет ни одного слова.
+    """
+    terms = match_query(q)
+    if dialect_name == "postgresql":
+        vector = literal_column("task.search_vector")
+        query = func.plainto_tsquery("simple", q)
+        score = (-func.ts_rank_cd(vector, query, type_=Float)).label("score")
+        return select(Task, score, Task.id).where(vector.op("@@")(query)), score
+    fts = table("task_fts", column("rowid"))
+    score = func.bm25(literal_column("task_fts"), NAME_WEIGHT, DESCRIPTION_WEIGHT, type_=Float).label("score")
+    statement = (
+        select(Task, score, Task.id)
+        .join(fts, fts.c.rowid == Task.id)
+        .where(literal_column("task_fts").op("MATCH")(terms))
+    )
+    return statement, score
@@ -0,0 +1,134 @@
+import os
+from typing import Optional, Sequence
+
+import orjson
+from dotenv import load_dotenv
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlmodel import SQLModel
+
+from pagination import paginate
+
+load_dotenv()
+
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+
+
+class FastJSONResponse(Response):
+    """Ответ JSON, сериализованный orjson без повторной валидации по response_model."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def parse_fields(fields: Optional[str], read_model: type[SQLModel]) -> Optional[list[str]]:
+    """
+    Разобрать параметр fields (список полей через запятую) и проверить его по модели чтения.
+
+    Args:
+        fields (Optional[str]): Значение параметра, например "id,name,deadline".
+        read_model (type[SQLModel]): Модель чтения (TaskRead и т.д.).
+
+    Returns:
+        Optional[list[str]]: Поля без повторов в порядке запроса или None, если параметр не задан.
+
+    Raises:
+        HTTPException: Если список пуст или содержит поля, которых нет в модели.
+    """
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in read_model.model_fields]
+    if not names or unknown:
+        detail = f"Unknown fields: {', '.join(unknown)}" if unknown else "Empty fields"
+        raise HTTPException(status_code=400, detail=f"{detail}. Allowed: {', '.join(read_model.model_fields)}")
+    return names
+
+
+def read_columns(table: type[SQLModel], read_model: type[SQLModel], fields: Optional[list[str]] = None) -> list:
+    """
+    Получить колонки таблицы, которые нужны модели чтения, в порядке её полей.
+
+    Поля модели, которых нет в таблице (например, вложенные списки), пропускаются.
+
+    Args:
+        table (type[SQLModel]): Табличная модель.
+        read_model (type[SQLModel]): Модель чтения (TaskRead и т.д.).
+        fields (Optional[list[str]]): Только эти поля (из parse_fields) вместо всех полей модели.
+
+    Returns:
+        list: Колонки для select.
+    """
+    names = read_model.model_fields if fields is None else fields
+    return [table.__table__.c[name] for name in names if name in table.__table__.c]
+
+
+def projection(columns: list, order_by: Sequence) -> tuple[list, list[str]]:
+    """
+    Дополнить колонки проекции колонками сортировки, нужными для курсора.
+
+    Args:
+        columns (list): Колонки из read_columns.
+        order_by (Sequence): Колонки сортировки.
+
+    Returns:
+        tuple[list, list[str]]: Колонки для select и ключи ответа (первые колонки строки).
+    """
+    keys = [column.key for column in columns]
+    return columns + [column for column in order_by if column.key not in keys], keys
+
+
+def fast_response(content, response: Response) -> FastJSONResponse:
+    """
+    Построить FastJSONResponse с заголовками, выставленными зависимостями (например, ETag).
+
+    Args:
+        content: Данные из словарей, списков и простых значений.
+        response (Response): Ответ, в который зависимости записали заголовки.
+
+    Returns:
+        FastJSONResponse: Готовый ответ.
+    """
+    fast = FastJSONResponse(content)
+    fast.raw_headers.extend(response.headers.raw)
+    return fast
+
+
+async def paginate_read(session, statement, read_model: type[SQLModel], order_by: Sequence,
+                        cursor: Optional[str], limit: int, response: Response, fields: Optional[str] = None,
+                        descending: bool = False):
+    """
+    Получить страницу списка через paginate или напрямую из колонок.
+
+    Если задан fields или FAST_JSON=1, выбираются только нужные колонки (запрошенные
+    поля и колонки сортировки для курсора), а строки отдаются напрямую в orjson,
+    минуя создание ORM-объектов и валидацию по response_model. Без fields формат
+    ответа совпадает с обычным.
+
+    Args:
+        session (Session): Сессия базы данных.
+        statement: Запрос select(Model) с условиями where, без сортировки и лимита.
+        read_model (type[SQLModel]): Модель чтения элементов страницы.
+        order_by (Sequence): Колонки сортировки, как в paginate.
+        cursor (Optional[str]): Курсор предыдущей страницы.
+        limit (int): Размер страницы.
+        response (Response): Ответ, в который зависимости записали заголовки.
+        fields (Optional[str]): Поля элементов через запятую (sparse fieldset).
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        dict | FastJSONResponse: Страница для response_model или готовый ответ.
+    """
+    selected = parse_fields(fields, read_model)
+    if selected is None and not FAST_JSON:
+        return await paginate(session, statement, order_by, cursor, limit, descending)
+    table = statement.column_descriptions[0]["entity"]
+    columns, keys = projection(read_columns(table, read_model, selected), order_by)
+    columns = select(*columns)
+    if statement.whereclause is not None:
+        columns = columns.where(statement.whereclause)
+    page = await paginate(session, columns, order_by, cursor, limit, descending)
+    return fast_response({"items": [dict(zip(keys, row)) for row in page["items"]],
+                          "next_cursor": page["next_cursor"]}, response)
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Iterable
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlmodel import select
+
+from auth import get_current_user
+from connection import dialect_insert, get_session
+from models import CollectionVersion, User
+
+
+async def bump_versions(session, user_ids: Iterable[int], *collections: str) -> None:
+    """
+    Увеличить версии коллекций пользователей в текущей транзакции.
+
+    Args:
+        session (Session): Сессия базы данных.
+        user_ids (Iterable[int]): Владельцы изменённых коллекций.
+        *collections (str): Изменённые коллекции.
+    """
+    rows = [
+        {"user_id": user_id, "collection": collection, "version": 1}
+        for user_id in set(user_ids)
+        for collection in collections
+    ]
+    if not rows:
+        return
+    statement = dialect_insert(CollectionVersion).values(rows)
+    await session.execute(statement.on_conflict_do_update(
+        index_elements=["user_id", "collection"],
+        set_={"version": CollectionVersion.version + 1},
+    ))
+
+
+def collection_etag(*collections: str):
+    """
+    Создать зависимость, которая ставит ETag списка и отвечает 304 при совпадении.
+
+    ETag строится из версий коллекций пользователя и параметров запроса, поэтому при
+    совпадении с If-None-Match ответ 304 уходит без чтения строк и сериализации.
+
+    Args:
+        *collections (str): Коллекции, от которых зависит содержимое списка.
+
+    Returns:
+        Callable: Зависимость FastAPI.
+    """
+    async def dependency(request: Request, response: Response, session=Depends(get_session),
+                         user: User = Depends(get_current_user)) -> str:
+        statement = select(CollectionVersion.collection, CollectionVersion.version).where(
+            CollectionVersion.user_id == user.id, CollectionVersion.collection.in_(collections)
+        )
+        versions = dict((await session.execute(statement)).all())
+        query = hashlib.blake2b(str(request.query_params).encode(), digest_size=6).hexdigest()
+        etag = f'W/"{user.id}-{".".join(str(versions.get(name, 0)) for name in collections)}-{query}"'
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency